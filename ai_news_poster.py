@@ -12,8 +12,39 @@ import random
 from datetime import datetime, timedelta
 from real_time_news_aggregator import AINewsAggregator
 from infinite_content_engine import InfiniteContentEngine
+from keyword_matcher import KeywordMatcher
 import re
 
+# Common AI tools and platforms: keyword -> display name
+TRENDING_TOOL_KEYWORDS = {
+    'chatgpt': 'ChatGPT',
+    'claude': 'Claude',
+    'midjourney': 'Midjourney',
+    'dall-e': 'DALL-E',
+    'stable diffusion': 'Stable Diffusion',
+    'runway': 'Runway',
+    'luma': 'Luma AI',
+    'suno': 'Suno',
+    'eleven labs': 'ElevenLabs',
+    'perplexity': 'Perplexity',
+    'anthropic': 'Claude/Anthropic',
+    'openai': 'OpenAI',
+    'google gemini': 'Google Gemini',
+    'zapier': 'Zapier',
+    'make.com': 'Make.com',
+    'notion': 'Notion AI'
+}
+TRENDING_TOOL_MATCHER = KeywordMatcher(TRENDING_TOOL_KEYWORDS)
+
+# Prompt categories in priority order: the first category with a hit wins
+PROMPT_CATEGORY_KEYWORDS = {
+    'marketing': ['social media', 'content', 'marketing', 'advertising'],
+    'automation': ['automation', 'ai', 'tool', 'software'],
+    'business': ['business', 'strategy', 'entrepreneur'],
+    'finance': ['finance', 'investment', 'money']
+}
+PROMPT_CATEGORY_MATCHER = KeywordMatcher.from_groups(PROMPT_CATEGORY_KEYWORDS)
+
 class AINewsPoster:
     def __init__(self):
         """Initialize AI News Poster with new credentials"""
@@ -385,18 +416,8 @@ Your experience might be exactly what someone else needs to hear. Every automati
     
     def categorize_prompt(self, title):
         """Categorize prompt for better selection"""
-        title_lower = title.lower()
-        
-        if any(word in title_lower for word in ['social media', 'content', 'marketing', 'advertising']):
-            return 'marketing'
-        elif any(word in title_lower for word in ['automation', 'ai', 'tool', 'software']):
-            return 'automation'
-        elif any(word in title_lower for word in ['business', 'strategy', 'entrepreneur']):
-            return 'business'
-        elif any(word in title_lower for word in ['finance', 'investment', 'money']):
-            return 'finance'
-        else:
-            return 'general'
+        categories = PROMPT_CATEGORY_MATCHER.group_counts(title)
+        return next(iter(categories), 'general')
     
     def get_fallback_prompts(self):
         """Fallback prompts if file loading fails"""
@@ -440,30 +461,11 @@ Your experience might be exactly what someone else needs to hear. Every automati
         trending_tools = []
         
         for item in news_items:
-            text = f"{item['title']} {item['content']}".lower()
-            
-            # Common AI tools and platforms
-            tool_keywords = {
-                'chatgpt': 'ChatGPT',
-                'claude': 'Claude',
-                'midjourney': 'Midjourney',
-                'dall-e': 'DALL-E',
-                'stable diffusion': 'Stable Diffusion',
-                'runway': 'Runway',
-                'luma': 'Luma AI',
-                'suno': 'Suno',
-                'eleven labs': 'ElevenLabs',
-                'perplexity': 'Perplexity',
-                'anthropic': 'Claude/Anthropic',
-                'openai': 'OpenAI',
-                'google gemini': 'Google Gemini',
-                'zapier': 'Zapier',
-                'make.com': 'Make.com',
-                'notion': 'Notion AI'
-            }
+            text = f"{item['title']} {item['content']}"
             
-            for keyword, tool_name in tool_keywords.items():
-                if keyword in text and tool_name not in trending_tools:
+            for keyword in TRENDING_TOOL_MATCHER.find_all(text):
+                tool_name = TRENDING_TOOL_KEYWORDS[keyword]
+                if tool_name not in trending_tools:
                     trending_tools.append(tool_name)
         
         # Add some always-relevant tools if list is empty
@@ -634,8 +636,7 @@ I've built similar automation systems and can walk you through the specific setu
         # 95% chance to use Infinite Content Engine - NEVER REPEATS
         if self.should_use_infinite_content():
             print("🧠 Using Infinite Content Engine - Guaranteed unique content")
-            print("🔄 Scraping latest AI tools from free-for.dev and blog.pareto.io...")
-            title, content = self.infinite_engine.generate_infinite_content()
+            title, content = self.infinite_engine.next_pooled_post()
             print(f"✅ Generated completely unique content: {title[:60]}...")
         elif weekday == 0:  # Monday - Passive Income Ideas
             title, content = self.generate_daily_ai_news()
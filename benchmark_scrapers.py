@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Scraper Benchmark - Replays recorded HTTP fixtures through the scrapers
+Reports wall time, parse time, peak allocations and tools/sec on a machine
+without network access, so parser and engine changes can be compared
+
+Usage:
+    python benchmark_scrapers.py --record       # capture fixtures from the live sites once
+    python benchmark_scrapers.py [--runs N]     # replay them (default 5 runs per scenario)
+    python benchmark_scrapers.py --verbose      # keep the scrapers' own output
+
+Fixtures go to HTTP_FIXTURES_DIR (default ./http_fixtures) and are not committed.
+"""
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+SCENARIOS = {
+    'scrape_free_for_dev_tools': lambda engine: len(engine.scrape_free_for_dev_tools()),
+    'scrape_pareto_ai_tools': lambda engine: len(engine.scrape_pareto_ai_tools()),
+    'update_ai_tools_database': lambda engine: (engine.update_ai_tools_database(force=True, crawl=True),
+                                                engine.tool_store.count())[1],
+}
+
+
+def build_engine(mode, fixtures_dir):
+    """InfiniteContentEngine whose HTTP goes through the replay layer"""
+    os.environ['HTTP_REPLAY_MODE'] = mode
+    os.environ['HTTP_FIXTURES_DIR'] = fixtures_dir
+    from infinite_content_engine import InfiniteContentEngine
+    return InfiniteContentEngine()
+
+
+def isolate(engine, workdir):
+    """Point scrape-side state at a scratch directory so every run starts cold and /tmp is untouched"""
+    from directory_crawler import DirectoryCrawler
+    from http_cache import HTTPCache
+    from infinite_content_engine import AITool
+    from tool_store import ToolStore
+
+    engine.http_cache = HTTPCache(os.path.join(workdir, 'http_cache'), session=engine.http_session,
+                                  scheduler=engine.http_cache.scheduler)
+    engine.tool_store = ToolStore(AITool, os.path.join(workdir, 'tools.db'))
+    engine.directory_crawler = DirectoryCrawler(engine.http_cache, os.path.join(workdir, 'crawl.db'))
+    engine.parse_stats = {}
+    engine.failed_sources = set()
+    engine.crawl_done = False
+
+
+def parse_seconds(engine):
+    """Total parse time recorded by the engine and the directory crawler"""
+    stats = list(engine.parse_stats.values()) + list(engine.directory_crawler.parse_stats.values())
+    return sum(stat.seconds for stat in stats)
+
+
+def run_scenario(engine, scenario, verbose, trace_memory=False):
+    """One cold run; returns (wall seconds, parse seconds, tools, peak bytes or None)"""
+    with tempfile.TemporaryDirectory() as workdir:
+        isolate(engine, workdir)
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        peak = None
+        with output:
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            tools = SCENARIOS[scenario](engine)
+            wall = time.perf_counter() - start
+            if trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        parse = parse_seconds(engine)
+        engine.tool_store.close()
+        engine.directory_crawler.close()
+        return wall, parse, tools, peak
+
+
+def benchmark(runs=5, verbose=False, fixtures_dir=None):
+    """Replay every scenario `runs` times and print a summary table"""
+    fixtures_dir = fixtures_dir or os.getenv('HTTP_FIXTURES_DIR', 'http_fixtures')
+    engine = build_engine('replay', fixtures_dir)
+
+    print(f"\n📊 Scraper benchmark ({runs} runs, fixtures: {fixtures_dir})")
+    print(f"{'scenario':<28} {'wall ms':>9} {'parse ms':>9} {'tools':>6} {'tools/s':>9} {'peak MB':>8}")
+    results = {}
+    for scenario in SCENARIOS:
+        timings = [run_scenario(engine, scenario, verbose) for _ in range(runs)]
+        # Allocations come from a separate run: tracing slows everything it measures
+        _, _, _, peak = run_scenario(engine, scenario, verbose, trace_memory=True)
+
+        wall = statistics.median(timing[0] for timing in timings)
+        parse = statistics.median(timing[1] for timing in timings)
+        tools = timings[-1][2]
+        results[scenario] = {'wall_seconds': wall, 'parse_seconds': parse, 'tools': tools,
+                             'tools_per_second': tools / wall if wall else 0.0, 'peak_bytes': peak}
+        print(f"{scenario:<28} {wall * 1000:>9.1f} {parse * 1000:>9.1f} {tools:>6} "
+              f"{results[scenario]['tools_per_second']:>9.0f} {peak / 1024 / 1024:>8.1f}")
+
+    session = engine.http_session
+    print(f"🎞️ Fixtures replayed: {session.hits}, missing: {session.misses}")
+    if session.misses:
+        print("⚠️ Some requests had no fixture - run with --record on a networked machine first")
+    return results
+
+
+def record(fixtures_dir=None):
+    """Run every scenario once against the live sites, saving the responses"""
+    fixtures_dir = fixtures_dir or os.getenv('HTTP_FIXTURES_DIR', 'http_fixtures')
+    engine = build_engine('record', fixtures_dir)
+    for scenario in SCENARIOS:
+        print(f"🔴 Recording {scenario}...")
+        run_scenario(engine, scenario, verbose=True)
+    print(f"✅ Fixtures saved to {fixtures_dir}")
+
+
+if __name__ == "__main__":
+    if "--record" in sys.argv:
+        record()
+    else:
+        runs = 5
+        if "--runs" in sys.argv:
+            runs = int(sys.argv[sys.argv.index("--runs") + 1])
+        benchmark(runs, verbose="--verbose" in sys.argv)
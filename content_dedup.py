@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Content Dedup Index - Persistent history of every posted content hash
+Append-only hash log on disk, loaded once into a Bloom filter and an exact
+digest table for O(1) membership, plus a MinHash LSH index that flags
+near-duplicate posts
+"""
+
+import hashlib
+import math
+import os
+import random
+import re
+import struct
+import time
+from array import array
+
+# Each log record: 16-byte MD5 digest + uint32 unix timestamp
+RECORD = struct.Struct('<16sI')
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.001):
+        """Size the bit array for capacity items at the given false positive rate"""
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = int(math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / self.capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest):
+        """Bit positions for a digest using double hashing"""
+        h1, h2 = struct.unpack_from('<QQ', digest)
+        h2 |= 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, digest):
+        """Add a 16-byte digest"""
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, digest):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+
+class ContentHashIndex:
+    def __init__(self, log_path="/tmp/reddit_bot_hashes.bin", window_days=None, error_rate=0.001):
+        """Load the hash log and build the in-memory Bloom filter"""
+        self.log_path = log_path
+        self.window_days = window_days
+        self.error_rate = error_rate
+        self.bloom = BloomFilter(10000, error_rate)
+        self.digests = {}  # digest -> newest timestamp, so a Bloom hit never rereads the log
+        self.load()
+
+    def cutoff(self):
+        """Oldest timestamp still inside the dedup window"""
+        if not self.window_days:
+            return 0
+        return int(time.time() - self.window_days * 86400)
+
+    def iter_records(self):
+        """Yield (digest, timestamp) for every complete record in the log"""
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, 'rb') as f:
+            data = f.read()
+        usable = len(data) - len(data) % RECORD.size
+        yield from RECORD.iter_unpack(data[:usable])
+
+    def load(self):
+        """Rebuild the Bloom filter from the log, dropping a torn trailing record"""
+        records = [(digest, ts) for digest, ts in self.iter_records() if ts >= self.cutoff()]
+        self.bloom = BloomFilter(max(10000, len(records) * 2), self.error_rate)
+        self.digests = {}
+        for digest, ts in records:
+            self.bloom.add(digest)
+            self.digests[digest] = ts
+
+        # Rewrite the log if it had a partial record or expired entries
+        if os.path.exists(self.log_path) and os.path.getsize(self.log_path) != len(records) * RECORD.size:
+            self.rewrite(records)
+
+    def rewrite(self, records):
+        """Atomically replace the log with the given records"""
+        tmp_path = f"{self.log_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(b''.join(RECORD.pack(digest, ts) for digest, ts in records))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.log_path)
+
+    def __len__(self):
+        return self.bloom.count
+
+    def contains_digest(self, digest):
+        """Exact membership; the digest table settles Bloom hits"""
+        if digest not in self.bloom:
+            return False
+        return self.digests.get(digest, -1) >= self.cutoff()
+
+    def add_digest(self, digest):
+        """Append a digest to the log and the filter"""
+        now = int(time.time())
+        with open(self.log_path, 'ab') as f:
+            f.write(RECORD.pack(digest, now))
+        self.bloom.add(digest)
+        self.digests[digest] = now
+
+        # Grow the filter before the false positive rate degrades
+        if self.bloom.count > self.bloom.capacity:
+            self.load()
+
+    def add_digests(self, digests):
+        """Append several digests with a single write"""
+        now = int(time.time())
+        with open(self.log_path, 'ab') as f:
+            f.write(b''.join(RECORD.pack(digest, now) for digest in digests))
+        for digest in digests:
+            self.bloom.add(digest)
+            self.digests[digest] = now
+        if self.bloom.count > self.bloom.capacity:
+            self.load()
+
+    def check_and_add(self, content):
+        """Return True and record the content if it was never seen before"""
+        digest = hashlib.md5(content.encode()).digest()
+        if self.contains_digest(digest):
+            return False
+        self.add_digest(digest)
+        return True
+
+    def import_hex_hashes(self, hex_hashes):
+        """Import MD5 hex digests from the old in-memory history"""
+        imported = 0
+        for hex_hash in hex_hashes:
+            digest = bytes.fromhex(hex_hash)
+            if not self.contains_digest(digest):
+                self.add_digest(digest)
+                imported += 1
+        return imported
+
+
+class NearDuplicateIndex:
+    MERSENNE_PRIME = (1 << 61) - 1
+
+    def __init__(self, path="/tmp/reddit_bot_minhash.bin", threshold=0.85,
+                 num_perm=64, bands=8, shingle_size=3):
+        """Load stored MinHash signatures and bucket them into LSH bands (path=None keeps it in memory)"""
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.path = path
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.record_size = num_perm * 4
+
+        # Fixed seed so signatures stay comparable across runs
+        rng = random.Random(1)
+        self.perms = [(rng.randrange(1, self.MERSENNE_PRIME), rng.randrange(0, self.MERSENNE_PRIME))
+                      for _ in range(num_perm)]
+
+        self.signatures = []
+        self.buckets = {}
+        self.load()
+
+    def shingles(self, content):
+        """Hashed word shingles; numbers are masked so dates and figures do not count"""
+        words = re.findall(r"[a-z0-9$']+", re.sub(r'\d', '0', content.lower()))
+        if len(words) < self.shingle_size:
+            words = words + [''] * (self.shingle_size - len(words))
+        return {
+            int.from_bytes(hashlib.blake2b(' '.join(words[i:i + self.shingle_size]).encode(),
+                                           digest_size=8).digest(), 'little')
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    def signature(self, content):
+        """MinHash signature of a post"""
+        hashes = self.shingles(content)
+        prime = self.MERSENNE_PRIME
+        return array('I', [min((a * h + b) % prime for h in hashes) & 0xFFFFFFFF for a, b in self.perms])
+
+    def band_keys(self, signature):
+        """One bucket key per LSH band"""
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.bands)]
+
+    def load(self):
+        """Rebuild the LSH buckets from the signature file"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        usable = len(data) - len(data) % self.record_size
+        for offset in range(0, usable, self.record_size):
+            self._index(array('I', data[offset:offset + self.record_size]))
+
+        # Drop a torn trailing record so later appends stay aligned
+        if usable != len(data):
+            with open(self.path, 'r+b') as f:
+                f.truncate(usable)
+
+    def _index(self, signature):
+        """Add a signature to memory"""
+        signature_id = len(self.signatures)
+        self.signatures.append(signature)
+        for key in self.band_keys(signature):
+            self.buckets.setdefault(key, []).append(signature_id)
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def max_similarity(self, content, signature=None):
+        """Estimated Jaccard similarity to the closest previous post (LSH candidates only)"""
+        signature = signature or self.signature(content)
+        candidates = set()
+        for key in self.band_keys(signature):
+            candidates.update(self.buckets.get(key, ()))
+
+        best = 0.0
+        for candidate_id in candidates:
+            stored = self.signatures[candidate_id]
+            matches = sum(1 for x, y in zip(signature, stored) if x == y)
+            best = max(best, matches / self.num_perm)
+        return best
+
+    def is_near_duplicate(self, content, signature=None):
+        """True if a previous post is at least `threshold` similar"""
+        return self.max_similarity(content, signature) >= self.threshold
+
+    def add(self, content, signature=None):
+        """Record a post's signature on disk and in the buckets"""
+        signature = signature or self.signature(content)
+        self.add_signatures([signature])
+        return signature
+
+    def add_signatures(self, signatures):
+        """Record several signatures with a single write"""
+        if self.path:
+            with open(self.path, 'ab') as f:
+                f.write(b''.join(signature.tobytes() for signature in signatures))
+        for signature in signatures:
+            self._index(signature)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Content Pool - Persisted queue of ready-to-publish posts
+Posts are generated ahead of time and dequeued at posting time, so a
+scheduled run does not wait for scraping and rendering
+"""
+
+import sqlite3
+import threading
+import time
+
+
+class ContentPool:
+    def __init__(self, db_path="/tmp/reddit_bot_content_pool.db"):
+        """Open (or create) the pool database"""
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS posts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+
+    def add_posts(self, posts):
+        """Append (title, content) posts to the back of the queue"""
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO posts (title, content, created_at) VALUES (?, ?, ?)",
+                [(title, content, now) for title, content in posts]
+            )
+        return len(posts)
+
+    def pop(self):
+        """Remove and return the oldest post as (title, content, created_at), or None if empty"""
+        with self.lock:
+            while True:
+                row = self.conn.execute(
+                    "SELECT id, title, content, created_at FROM posts ORDER BY id LIMIT 1").fetchone()
+                if row is None:
+                    return None
+                with self.conn:
+                    claimed = self.conn.execute("DELETE FROM posts WHERE id = ?", (row[0],)).rowcount
+                # Another process may have taken the same row first
+                if claimed:
+                    return row[1], row[2], row[3]
+
+    def count(self):
+        """Number of posts waiting in the pool"""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Directory Crawler - Resumable crawl of AI tool directory listings
+Listing pages are tracked in a persistent SQLite frontier: an interrupted
+crawl resumes where it stopped, pages already crawled in the current pass
+are never fetched again, and recrawls stop paging as soon as a listing page
+shows no new tools
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Optional, Set
+from urllib.parse import urljoin
+
+from html_parsing import parse_tags
+from tool_names import canonical_tool_name
+
+
+@dataclass
+class DirectorySource:
+    name: str
+    listing_url: str  # Newest-first listing, with {page} for the page number
+    tool_link: str  # Regex matching a tool detail link; group 1 is the tool slug
+    category: str = "ai_tools"
+    max_pages: int = 40
+    first_page: int = 1
+    exclude_slugs: Set[str] = field(default_factory=set)
+    link_pattern: Optional[re.Pattern] = None
+
+    def __post_init__(self):
+        self.link_pattern = re.compile(self.tool_link)
+
+    def page_url(self, page):
+        """URL of listing page `page`"""
+        return self.listing_url.format(page=page)
+
+
+# Best-effort listing layouts; a layout change only costs that source's tools
+DIRECTORY_SOURCES = [
+    DirectorySource(
+        name="theresanaiforthat",
+        listing_url="https://theresanaiforthat.com/just-released/?page={page}",
+        tool_link=r"^(?:https?://(?:www\.)?theresanaiforthat\.com)?/ai/([\w-]+)/?$"
+    ),
+    DirectorySource(
+        name="futurepedia",
+        listing_url="https://www.futurepedia.io/ai-tools?sort=new&page={page}",
+        tool_link=r"^(?:https?://(?:www\.)?futurepedia\.io)?/tool/([\w-]+)/?$"
+    ),
+    DirectorySource(
+        name="aitoolnet",
+        listing_url="https://www.aitoolnet.com/?page={page}",
+        tool_link=r"^(?:https?://(?:www\.)?aitoolnet\.com)?/([\w-]+)/?$",
+        exclude_slugs={"category", "categories", "blog", "about", "contact", "submit", "login",
+                       "register", "privacy", "terms", "new", "free", "trending", "search"}
+    ),
+    DirectorySource(
+        name="toolify",
+        listing_url="https://www.toolify.ai/new?page={page}",
+        tool_link=r"^(?:https?://(?:www\.)?toolify\.ai)?/tool/([\w-]+)/?$"
+    ),
+    DirectorySource(
+        name="producthunt",
+        listing_url="https://www.producthunt.com/topics/artificial-intelligence",
+        tool_link=r"^(?:https?://(?:www\.)?producthunt\.com)?/(?:products|posts)/([\w-]+)/?$",
+        max_pages=1
+    ),
+]
+
+
+def clean_text(text, limit):
+    """Collapse whitespace and cap length"""
+    return ' '.join(text.split())[:limit]
+
+
+def extract_json_ld_tools(soup, page_url):
+    """Tools listed in schema.org ItemList JSON-LD blocks"""
+    records = []
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or '')
+        except ValueError:
+            continue
+        blocks = data if isinstance(data, list) else data.get('@graph', [data]) if isinstance(data, dict) else []
+        for block in blocks:
+            if not isinstance(block, dict) or block.get('@type') != 'ItemList':
+                continue
+            for element in block.get('itemListElement', []):
+                item = element.get('item', element) if isinstance(element, dict) else None
+                if not isinstance(item, dict) or not item.get('name'):
+                    continue
+                records.append({
+                    'name': clean_text(str(item['name']), 80),
+                    'url': urljoin(page_url, str(item.get('url') or '')),
+                    'description': clean_text(str(item.get('description') or ''), 300)
+                })
+    return records
+
+
+def extract_link_cards(soup, source, page_url):
+    """Tools from anchors pointing at detail pages; the first text in a card is its name"""
+    records = {}
+    for link in soup.find_all('a', href=True):
+        match = source.link_pattern.match(link['href'])
+        if not match or match.group(1).lower() in source.exclude_slugs:
+            continue
+        slug = match.group(1).lower()
+        strings = list(link.stripped_strings)
+        name = link.get('title') or link.get('aria-label') or (strings[0] if strings else '')
+        name = clean_text(name, 80)
+        description = clean_text(' '.join(strings[1:]), 300)
+
+        # Cards often link the logo and the title separately; keep the richest anchor
+        record = records.get(slug)
+        if record is None:
+            records[slug] = {'name': name, 'url': urljoin(page_url, link['href']), 'description': description}
+        else:
+            record['name'] = record['name'] or name
+            if len(description) > len(record['description']):
+                record['description'] = description
+    return [record for record in records.values() if len(record['name']) >= 2]
+
+
+def extract_directory_tools(soup, source, page_url):
+    """Per-source extraction: JSON-LD when the page ships it, detail-page links otherwise"""
+    records = extract_json_ld_tools(soup, page_url) or extract_link_cards(soup, source, page_url)
+    for record in records:
+        record['category'] = source.category
+    return records
+
+
+class DirectoryCrawler:
+    def __init__(self, http_cache, db_path="/tmp/ai_directory_crawl.db", sources=None,
+                 max_workers=4, max_attempts=3, track_parse_memory=False):
+        """Open the crawl frontier; fetches go through http_cache (and its rate limiter)"""
+        self.http_cache = http_cache
+        self.sources = {source.name: source for source in (sources or DIRECTORY_SOURCES)}
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.track_parse_memory = track_parse_memory
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+        }
+        self.parse_stats = {}
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.lock, self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS passes (
+                    source TEXT PRIMARY KEY,
+                    pass_id INTEGER NOT NULL,
+                    started_at REAL NOT NULL,
+                    finished_at REAL,
+                    completed_passes INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS frontier (
+                    source TEXT NOT NULL,
+                    pass_id INTEGER NOT NULL,
+                    page INTEGER NOT NULL,
+                    url TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    fetched_at REAL,
+                    tools_found INTEGER,
+                    new_tools INTEGER,
+                    PRIMARY KEY (source, pass_id, page)
+                );
+            """)
+
+    def begin_pass(self, source_name):
+        """Resume the source's unfinished pass, or start a new one; returns (pass_id, incremental)"""
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT pass_id, finished_at, completed_passes FROM passes WHERE source = ?", (source_name,)
+            ).fetchone()
+            if row and row[1] is None:
+                return row[0], row[2] > 0
+            pass_id = row[0] + 1 if row else 1
+            completed = row[2] if row else 0
+            self.conn.execute(
+                "INSERT INTO passes (source, pass_id, started_at, finished_at, completed_passes) "
+                "VALUES (?, ?, ?, NULL, ?) ON CONFLICT(source) DO UPDATE SET "
+                "pass_id = excluded.pass_id, started_at = excluded.started_at, finished_at = NULL",
+                (source_name, pass_id, time.time(), completed)
+            )
+            # Only the current pass is kept in the frontier
+            self.conn.execute("DELETE FROM frontier WHERE source = ? AND pass_id < ?", (source_name, pass_id))
+            return pass_id, completed > 0
+
+    def finish_pass(self, source_name, pass_id):
+        """Mark the source's pass complete so the next crawl starts from the first page"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE passes SET finished_at = ?, completed_passes = completed_passes + 1 "
+                "WHERE source = ? AND pass_id = ?",
+                (time.time(), source_name, pass_id)
+            )
+
+    def has_unfinished_pass(self):
+        """True if an earlier crawl stopped before finishing a source"""
+        row = self.conn.execute("SELECT COUNT(*) FROM passes WHERE finished_at IS NULL").fetchone()
+        return row[0] > 0
+
+    def pass_pages(self, source_name, pass_id):
+        """Frontier rows of a pass as {page: (url, status, attempts)}"""
+        rows = self.conn.execute(
+            "SELECT page, url, status, attempts FROM frontier WHERE source = ? AND pass_id = ?",
+            (source_name, pass_id)
+        ).fetchall()
+        return {page: (url, status, attempts) for page, url, status, attempts in rows}
+
+    def record_page(self, source_name, pass_id, page, url, status, tools_found=None, new_tools=None):
+        """Store the outcome of a listing page fetch"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO frontier (source, pass_id, page, url, status, attempts, fetched_at, "
+                "tools_found, new_tools) VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?) "
+                "ON CONFLICT(source, pass_id, page) DO UPDATE SET status = excluded.status, "
+                "attempts = attempts + 1, fetched_at = excluded.fetched_at, "
+                "tools_found = excluded.tools_found, new_tools = excluded.new_tools",
+                (source_name, pass_id, page, url, status, time.time(), tools_found, new_tools)
+            )
+
+    def fetch_page(self, source, url):
+        """Listing page records, reusing the parsed result when the page is unchanged"""
+        response = self.http_cache.get(url, headers=self.headers, timeout=15)
+        if response.not_modified:
+            cached = self.http_cache.load_parsed(url, 'directory')
+            if cached is not None:
+                return cached
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+
+        soup, stats = parse_tags(response.content, ['a', 'script'], source.name,
+                                 track_memory=self.track_parse_memory)
+        self.parse_stats[source.name] = stats
+        records = extract_directory_tools(soup, source, url)
+        self.http_cache.save_parsed(url, 'directory', records)
+        return records
+
+    def crawl_source(self, source, is_known, deadline):
+        """Page through one source until it runs out of new tools, pages or time"""
+        pass_id, incremental = self.begin_pass(source.name)
+        pages = self.pass_pages(source.name, pass_id)
+        found = {}
+
+        # Pages finished earlier in this pass come back from the parsed cache, not the network
+        done_pages = sorted(page for page, (_, status, _) in pages.items() if status == 'done')
+        for page in done_pages:
+            for record in self.http_cache.load_parsed(pages[page][0], 'directory') or []:
+                found.setdefault(canonical_tool_name(record['name']), record)
+        if done_pages:
+            print(f"↩️ {source.name}: resuming after page {done_pages[-1]} ({len(found)} tools)")
+
+        page = done_pages[-1] + 1 if done_pages else source.first_page
+        while True:
+            if page >= source.first_page + source.max_pages:
+                self.finish_pass(source.name, pass_id)
+                break
+            if time.time() >= deadline:
+                print(f"⏸️ {source.name}: time budget used, will resume at page {page}")
+                break
+
+            url = source.page_url(page)
+            try:
+                records = self.fetch_page(source, url)
+            except Exception as e:
+                self.record_page(source.name, pass_id, page, url, 'failed')
+                attempts = pages.get(page, (url, 'failed', 0))[2] + 1
+                print(f"⚠️ {source.name} page {page} failed ({attempts}/{self.max_attempts}): {e}")
+                if attempts >= self.max_attempts:
+                    self.finish_pass(source.name, pass_id)
+                break
+
+            names = [record['name'] for record in records if canonical_tool_name(record['name']) not in found]
+            known = is_known(names)
+            new_tools = [name for name in names if name not in known]
+            for record in records:
+                found.setdefault(canonical_tool_name(record['name']), record)
+            self.record_page(source.name, pass_id, page, url, 'done', len(records), len(new_tools))
+
+            # Listings are newest first: a page with nothing new means the rest is already known
+            if not records or (incremental and not new_tools):
+                self.finish_pass(source.name, pass_id)
+                break
+            page += 1
+
+        return list(found.values())
+
+    def crawl(self, is_known, time_budget=240, source_names=None):
+        """Crawl every source concurrently; returns {source: [tool records]}
+
+        is_known(names) returns the subset of names already in the catalogue.
+        """
+        deadline = time.time() + time_budget
+        sources = [source for name, source in self.sources.items()
+                   if source_names is None or name in source_names]
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(sources)))) as executor:
+            futures = {executor.submit(self.crawl_source, source, is_known, deadline): source.name
+                       for source in sources}
+            for future in as_completed(futures):
+                source_name = futures[future]
+                try:
+                    results[source_name] = future.result()
+                    print(f"🕸️ {source_name}: {len(results[source_name])} tools")
+                except Exception as e:
+                    print(f"⚠️ Directory crawl error for {source_name}: {e}")
+        return results
+
+    def close(self):
+        """Close the frontier database"""
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Fetch Scheduler - Per-domain politeness for every scraper
+A token bucket spaces requests to the same domain and a semaphore caps how
+many run against it at once, while requests to different domains proceed
+concurrently
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=1):
+        """Allow `rate` requests per second with bursts of up to `capacity`"""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how long the caller must wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            # A negative balance is a queue of reservations, each one 1/rate apart
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class FetchScheduler:
+    def __init__(self, rate=0.5, burst=1, concurrency=2, domain_limits=None):
+        """Default limits apply to every domain not listed in domain_limits
+
+        domain_limits maps a domain to a dict with any of rate (requests/sec),
+        burst and concurrency.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.domain_limits = dict(domain_limits or {})
+        self.buckets = {}
+        self.semaphores = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def domain(url):
+        """Host a URL is rate limited under (www. is the same site)"""
+        host = (urlparse(url).hostname or url).lower()
+        return host[4:] if host.startswith('www.') else host
+
+    def limits(self, domain):
+        """Effective (rate, burst, concurrency) for a domain"""
+        limits = self.domain_limits.get(domain, {})
+        return (limits.get('rate', self.rate), limits.get('burst', self.burst),
+                limits.get('concurrency', self.concurrency))
+
+    def set_domain_limits(self, domain, **limits):
+        """Override limits for one domain (applies to buckets created afterwards)"""
+        with self.lock:
+            self.domain_limits[domain] = dict(self.domain_limits.get(domain, {}), **limits)
+            self.buckets.pop(domain, None)
+            self.semaphores.pop(domain, None)
+
+    def _controls(self, domain):
+        """Token bucket and semaphore for a domain, created on first use"""
+        with self.lock:
+            if domain not in self.buckets:
+                rate, burst, concurrency = self.limits(domain)
+                self.buckets[domain] = TokenBucket(rate, burst)
+                self.semaphores[domain] = threading.BoundedSemaphore(concurrency)
+            return self.buckets[domain], self.semaphores[domain]
+
+    @contextmanager
+    def slot(self, url):
+        """Hold a concurrency slot for the URL's domain, once its bucket allows a request"""
+        bucket, semaphore = self._controls(self.domain(url))
+        with semaphore:
+            bucket.acquire()
+            yield
+
+    def get(self, session, url, **kwargs):
+        """session.get() under the domain's rate limit"""
+        with self.slot(url):
+            return session.get(url, **kwargs)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+HTML Parsing - Tag-filtered parsing for scraped pages
+Builds only the elements a scraper asks for, with the fastest installed parser,
+and measures parse time and peak memory per source
+"""
+
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Prefer lxml (C parser) when installed, fall back to the stdlib parser
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+# tracemalloc is process-wide, so profiled parses run one at a time (unprofiled ones run freely)
+_profile_lock = threading.Lock()
+
+
+@dataclass
+class ParseStats:
+    source: str
+    parser: str
+    input_bytes: int
+    seconds: float
+    peak_bytes: Optional[int]
+
+    def summary(self):
+        """One-line human readable report"""
+        peak = f"{self.peak_bytes / 1024 / 1024:.1f} MB peak" if self.peak_bytes is not None else "peak n/a"
+        return (f"{self.source}: {self.input_bytes / 1024:.0f} KB parsed in {self.seconds * 1000:.0f} ms "
+                f"({self.parser}, {peak})")
+
+
+def parse_tags(content, tags, source, parser=None, track_memory=True):
+    """Parse only `tags` (and their contents) from an HTML document
+
+    Returns (soup, ParseStats). Peak memory is measured with tracemalloc and
+    also counts allocations made by other threads during the parse.
+    """
+    parser = parser or DEFAULT_PARSER
+    strainer = SoupStrainer(tags)
+
+    with _profile_lock if track_memory else nullcontext():
+        started_tracing = False
+        baseline = 0
+        if track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        soup = BeautifulSoup(content, parser, parse_only=strainer)
+        elapsed = time.perf_counter() - start
+
+        peak_bytes = None
+        if track_memory:
+            peak_bytes = tracemalloc.get_traced_memory()[1] - baseline
+            if started_tracing:
+                tracemalloc.stop()
+
+    stats = ParseStats(source=source, parser=parser, input_bytes=len(content),
+                       seconds=elapsed, peak_bytes=peak_bytes)
+    return soup, stats
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+HTTP Response Cache - Conditional GET for scraped pages
+Stores ETag/Last-Modified and a compressed body per URL so unchanged pages
+come back as 304 and skip both the download and the re-parse
+"""
+
+import requests
+import json
+import os
+import time
+import hashlib
+import pickle
+import zlib
+from contextlib import nullcontext
+
+
+class CachedResponse:
+    """Minimal response object returned by HTTPCache.get"""
+
+    def __init__(self, url, status_code, not_modified, body_path=None, content=None):
+        self.url = url
+        self.status_code = status_code
+        self.not_modified = not_modified
+        self._body_path = body_path
+        self._content = content
+
+    @property
+    def content(self):
+        """Response body, decompressed from disk only when a 304 is actually read"""
+        if self._content is None and self._body_path:
+            with open(self._body_path, 'rb') as f:
+                self._content = zlib.decompress(f.read())
+        return self._content
+
+
+class HTTPCache:
+    def __init__(self, cache_dir="/tmp/ai_tools_http_cache", session=None, scheduler=None):
+        """Initialize on-disk response cache (requests go through scheduler when given)"""
+        self.cache_dir = cache_dir
+        self.session = session or requests.Session()
+        self.scheduler = scheduler
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, url, suffix):
+        """Path of a cache file for a URL"""
+        digest = hashlib.sha1(url.encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.{suffix}")
+
+    def _write_atomic(self, path, data):
+        """Write bytes so a crash never leaves a half-written cache file"""
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def load_meta(self, url):
+        """Load validators stored for a URL"""
+        try:
+            with open(self._entry_path(url, 'json'), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, url, headers=None, timeout=10):
+        """GET a URL, sending a conditional request when validators are cached"""
+        request_headers = dict(headers or {})
+        meta = self.load_meta(url)
+        body_path = self._entry_path(url, 'body.z')
+        has_body = meta is not None and os.path.exists(body_path)
+
+        if has_body:
+            if meta.get('etag'):
+                request_headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request_headers['If-Modified-Since'] = meta['last_modified']
+
+        with self.scheduler.slot(url) if self.scheduler else nullcontext():
+            response = self.session.get(url, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and has_body:
+            meta['validated_at'] = time.time()
+            self._write_atomic(self._entry_path(url, 'json'), json.dumps(meta).encode())
+            return CachedResponse(url, 200, True, body_path=body_path)
+
+        if response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self._write_atomic(body_path, zlib.compress(response.content, 6))
+                self._write_atomic(self._entry_path(url, 'json'), json.dumps({
+                    'url': url,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'fetched_at': time.time(),
+                    'validated_at': time.time()
+                }).encode())
+            else:
+                # Old validators would make the next 304 vouch for a body this response replaced
+                for suffix in ('json', 'body.z'):
+                    if os.path.exists(self._entry_path(url, suffix)):
+                        os.remove(self._entry_path(url, suffix))
+            # Body changed, so anything parsed from the old body is stale
+            for name in os.listdir(self.cache_dir):
+                if name.startswith(os.path.basename(self._entry_path(url, 'parsed'))):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+        return CachedResponse(url, response.status_code, False, content=response.content)
+
+    def load_parsed(self, url, namespace):
+        """Load the result a scraper previously extracted from this URL"""
+        try:
+            with open(self._entry_path(url, f"parsed.{namespace}"), 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    def save_parsed(self, url, namespace, payload):
+        """Store a scraper's extracted result next to the cached body"""
+        try:
+            self._write_atomic(self._entry_path(url, f"parsed.{namespace}"), pickle.dumps(payload))
+        except Exception as e:
+            print(f"⚠️ Parsed cache save error: {e}")
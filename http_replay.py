@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+HTTP Replay - Record real responses once, replay them offline
+A drop-in for requests.Session.get: in record mode responses are fetched
+live and written to fixture files, in replay mode they are served from
+those files without touching the network
+
+Configured with HTTP_REPLAY_MODE (record | replay) and HTTP_FIXTURES_DIR
+"""
+
+import hashlib
+import json
+import os
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_FIXTURES_DIR = "http_fixtures"
+
+# Response headers kept in fixtures (enough for caching and decoding)
+RECORDED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control')
+
+
+class FixtureMissingError(requests.exceptions.ConnectionError):
+    """Replay mode was asked for a URL that was never recorded"""
+
+
+class ReplaySession:
+    def __init__(self, mode, fixtures_dir=DEFAULT_FIXTURES_DIR, session=None):
+        """mode is 'record' (live + save) or 'replay' (fixtures only)"""
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown HTTP replay mode: {mode}")
+        self.mode = mode
+        self.fixtures_dir = fixtures_dir
+        self.session = session or requests.Session()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+
+    def fixture_path(self, url, suffix):
+        """Fixture file for a URL"""
+        digest = hashlib.sha1(url.encode()).hexdigest()
+        return os.path.join(self.fixtures_dir, f"{digest}.{suffix}")
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        """GET a URL live (recording it) or from its fixture"""
+        if self.mode == 'record':
+            response = self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+            # 304s depend on the local cache state, so only full responses are recorded
+            if response.status_code != 304:
+                self.save_fixture(url, response)
+            return response
+        return self.replay(url, headers or {})
+
+    def save_fixture(self, url, response):
+        """Write one response as <sha1>.json metadata + <sha1>.body bytes"""
+        meta = {
+            'url': url,
+            'status_code': response.status_code,
+            'headers': {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            'encoding': response.encoding
+        }
+        with open(self.fixture_path(url, 'body'), 'wb') as f:
+            f.write(response.content)
+        with open(self.fixture_path(url, 'json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    def replay(self, url, headers):
+        """Build a requests.Response from the recorded fixture"""
+        try:
+            with open(self.fixture_path(url, 'json'), 'r') as f:
+                meta = json.load(f)
+            with open(self.fixture_path(url, 'body'), 'rb') as f:
+                body = f.read()
+        except OSError:
+            self.misses += 1
+            raise FixtureMissingError(f"No recorded fixture for {url}")
+        self.hits += 1
+
+        response = requests.Response()
+        response.url = url
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.encoding = meta.get('encoding')
+
+        # Honour validators so the conditional-GET path can be replayed too
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if ((etag and headers.get('If-None-Match') == etag)
+                or (last_modified and headers.get('If-Modified-Since') == last_modified)):
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = meta['status_code']
+            response._content = body
+        return response
+
+
+def session_from_env():
+    """ReplaySession configured by HTTP_REPLAY_MODE, or None for normal live requests"""
+    mode = os.getenv('HTTP_REPLAY_MODE', '').strip().lower()
+    if not mode or mode == 'off':
+        return None
+    return ReplaySession(mode, os.getenv('HTTP_FIXTURES_DIR', DEFAULT_FIXTURES_DIR))
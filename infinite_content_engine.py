@@ -9,15 +9,34 @@ from bs4 import BeautifulSoup
 import json
 import random
 import os
+import re
 import time
 from datetime import datetime, timedelta
 import hashlib
 import pickle
-import os
-from dataclasses import dataclass
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional
+from http_cache import HTTPCache
+from fetch_scheduler import FetchScheduler
+from http_replay import session_from_env
+from directory_crawler import DirectoryCrawler
+from tool_store import ToolStore
+from tool_names import canonical_tool_name
+from content_dedup import ContentHashIndex, NearDuplicateIndex
+from itertools import cycle
+from memory_journal import MemoryJournal
+from html_parsing import parse_tags
+from keyword_matcher import KeywordMatcher
+from template_compiler import CompiledTemplate
+from content_pool import ContentPool
 
-@dataclass
+# Fields whose values repeat across the catalogue; interned so equal values share one string
+AITOOL_INTERNED_FIELDS = ('description', 'category', 'pricing', 'use_case', 'income_potential')
+
+@dataclass(slots=True)
 class AITool:
     name: str
     description: str
@@ -26,6 +45,32 @@ class AITool:
     pricing: str
     use_case: str
     income_potential: str
+    
+    def __post_init__(self):
+        """Intern repeated categorical and boilerplate strings"""
+        for field_name in AITOOL_INTERNED_FIELDS:
+            value = getattr(self, field_name)
+            if type(value) is str:
+                setattr(self, field_name, sys.intern(value))
+    
+    def __setstate__(self, state):
+        """Restore from pickles, including ones written before AITool used slots"""
+        if isinstance(state, tuple):  # (instance dict, slot values)
+            state = {**(state[0] or {}), **(state[1] or {})}
+        for field_name, value in state.items():
+            setattr(self, field_name, value)
+        self.__post_init__()
+
+# Patterns for AI tool names mentioned in blog text
+TOOL_NAME_PATTERNS = [
+    re.compile(r'([A-Z][a-zA-Z]+\.ai)'),
+    re.compile(r'([A-Z][a-zA-Z]+AI)'),
+    re.compile(r'(GPT-\d+)'),
+    re.compile(r'([A-Z][a-zA-Z]+ AI)'),
+]
+
+# Link texts that mark AI/automation related tools on free-for.dev
+AI_LINK_KEYWORDS = KeywordMatcher(['ai', 'automation', 'machine learning', 'bot', 'workflow', 'api'])
 
 @dataclass
 class ContentTemplate:
@@ -33,17 +78,62 @@ class ContentTemplate:
     title_pattern: str
     content_structure: List[str]
     variables: Dict[str, List[str]]
+    context_fields: List[str] = field(default_factory=list)  # Fields supplied by the renderer
 
 class InfiniteContentEngine:
     def __init__(self):
         """Initialize infinite content generation system"""
         self.memory_file = "/tmp/reddit_bot_memory.json"
-        self.tools_cache = "/tmp/ai_tools_cache.pkl"
+        self.tools_cache = "/tmp/ai_tools.db"
+        self.legacy_tools_cache = "/tmp/ai_tools_cache.pkl"
+        
+        # Memory = snapshot file + append-only journal of post events
+        self.memory_journal = MemoryJournal(self.memory_file, "/tmp/reddit_bot_memory.journal")
+        self.pending_events = []
         self.content_history = self.load_memory()
-        self.ai_tools_db = []
+        
+        # Unbounded history of posted content hashes (None = keep forever)
+        self.dedup_window_days = None
+        self.content_index = ContentHashIndex("/tmp/reddit_bot_hashes.bin", self.dedup_window_days)
+        self.migrate_content_hashes()
+        
+        # MinHash LSH index that catches posts differing only in dates or figures
+        self.near_duplicate_threshold = 0.85
+        self.max_generation_attempts = 5
+        self.near_duplicate_index = NearDuplicateIndex("/tmp/reddit_bot_minhash.bin", self.near_duplicate_threshold)
+        
+        # Indexed tool catalogue (replaces the pickled list)
+        self.tool_store = ToolStore(AITool, self.tools_cache)
+        self.fresh_tools_limit = 10  # Least recently used tools offered per post
+        self.import_legacy_tools_cache()
+        self.migrate_used_tools()
+        
+        # Per-domain rate limits shared by every scraper (one request per 2s per domain)
+        self.fetch_scheduler = FetchScheduler(rate=0.5, burst=1, concurrency=2)
+        
+        # Recorded fixtures instead of the network when HTTP_REPLAY_MODE is set
+        # (replayed requests skip the politeness delays - nothing is sent)
+        self.http_session = session_from_env()
+        replaying = self.http_session is not None and self.http_session.mode == 'replay'
+        
+        # Conditional-GET cache so unchanged pages skip download and re-parse
+        self.http_cache = HTTPCache(session=self.http_session,
+                                    scheduler=None if replaying else self.fetch_scheduler)
+        
+        # Per-source parse time / peak memory from the last scrape
+        # (tracemalloc slows parsing several times over, so memory is opt-in)
+        self.parse_stats = {}
+        self.track_parse_memory = os.getenv('PARSE_PROFILE') == '1'
+        
+        # Resumable crawl of the AI tool directories (frontier persisted in SQLite)
+        self.directory_crawler = DirectoryCrawler(self.http_cache, "/tmp/ai_directory_crawl.db",
+                                                  track_parse_memory=self.track_parse_memory)
         
         # Content templates for infinite variation
         self.templates = self.load_content_templates()
+        self.compiled_templates = {
+            template.template_type: CompiledTemplate(template) for template in self.templates
+        }
         
         # Sources for infinite AI tools
         self.sources = {
@@ -58,36 +148,101 @@ class InfiniteContentEngine:
             ]
         }
         
+        # Each source refreshes on its own schedule (hours)
+        self.source_refresh_hours = {
+            'free_for_dev': 24,
+            'pareto_ai_blog': 24,
+            'ai_tool_directories': 24 * 7,
+            'directory_crawl': 12
+        }
+        self.failed_sources = set()  # Sources that came back empty, failed or timed out this run
+        
+        # Refresh all sources in parallel; a source that misses the timeout is skipped
+        self.concurrent_refresh = True
+        self.source_timeout = 30  # seconds per source
+        self.source_timeouts = {'directory_crawl': 300}  # Sources that need longer than the default
+        
+        # Long crawls only run when asked for (prefetch, --fill-pool, --crawl), never on the posting path,
+        # and at most once per engine even if they stop at their time budget with pages left
+        self.crawl_sources = {'directory_crawl'}
+        self.crawl_done = False
+        
+        # Pre-generated posts so posting is a dequeue; refilled below the low watermark
+        self.content_pool = ContentPool("/tmp/reddit_bot_content_pool.db")
+        self.pool_target_size = int(os.getenv('CONTENT_POOL_SIZE', '20'))
+        self.pool_low_watermark = int(os.getenv('CONTENT_POOL_LOW_WATERMARK', '5'))
+        self.pool_refill_thread = None
+        # Generation and history writes run one at a time: the background refill shares every index with posting
+        self.generation_lock = threading.Lock()
+        
         print("🧠 Infinite Content Engine initialized")
-        print(f"📚 Loaded {len(self.content_history)} previous posts in memory")
+        print(f"📚 Loaded {len(self.content_index)} previous posts in memory")
         print(f"🎯 Templates available: {len(self.templates)}")
+        print(f"📦 Pre-generated posts ready: {self.content_pool.count()}")
     
     def load_memory(self):
         """Load memory of previous posts to prevent repetition"""
+        default_memory = {
+            'last_update': None,
+            'content_variations': {},
+            'successful_formats': []
+        }
         try:
-            if os.path.exists(self.memory_file):
-                with open(self.memory_file, 'r') as f:
-                    return json.load(f)
+            return self.memory_journal.load(default_memory, self.apply_memory_event)
         except Exception as e:
             print(f"⚠️ Memory load error: {e}")
         
-        return {
-            'posted_content_hashes': [],
-            'used_tools': [],
-            'last_update': None,
-            'content_variations': {},
-            'successful_formats': []
+        return default_memory
+    
+    def apply_memory_event(self, memory, event):
+        """Fold one journal event into the in-memory state"""
+        if event['type'] == 'post':
+            variations = memory.setdefault('content_variations', {})
+            variations[event['format']] = variations.get(event['format'], 0) + 1
+            formats = memory.setdefault('successful_formats', [])
+            formats.append(event['format'])
+            del formats[:-50]  # Recent formats only
+            memory['last_post'] = {key: event[key] for key in ('hash', 'tools', 'format')}
+        memory['last_update'] = event['at']
+    
+    def record_post(self, content, tools, template_type):
+        """Queue a post event for the journal and apply it to memory"""
+        event = {
+            'type': 'post',
+            'hash': hashlib.md5(content.encode()).hexdigest(),
+            'tools': [tool.name for tool in tools],
+            'format': template_type,
+            'at': datetime.now().isoformat()
         }
+        self.apply_memory_event(self.content_history, event)
+        self.pending_events.append(event)
     
     def save_memory(self):
-        """Save memory to prevent future repetition"""
-        self.content_history['last_update'] = datetime.now().isoformat()
+        """Append pending events to the journal, compacting it periodically"""
         try:
-            with open(self.memory_file, 'w') as f:
-                json.dump(self.content_history, f, indent=2)
+            self.memory_journal.append(self.pending_events)
+            self.pending_events = []
+            if self.memory_journal.should_compact():
+                self.compact_memory()
         except Exception as e:
             print(f"⚠️ Memory save error: {e}")
     
+    def compact_memory(self):
+        """Rewrite the memory snapshot and empty the journal"""
+        self.content_history['last_update'] = datetime.now().isoformat()
+        try:
+            self.memory_journal.compact(self.content_history)
+        except Exception as e:
+            print(f"⚠️ Memory compaction error: {e}")
+    
+    def migrate_content_hashes(self):
+        """Move hashes kept in the memory file into the persistent dedup index"""
+        legacy_hashes = self.content_history.pop('posted_content_hashes', None)
+        if legacy_hashes:
+            imported = self.content_index.import_hex_hashes(legacy_hashes)
+            print(f"📦 Moved {imported} content hashes into the dedup index")
+            self.compact_memory()
+    
     def scrape_free_for_dev_tools(self):
         """Scrape AI/automation tools from free-for.dev"""
         print("🔍 Scraping free-for.dev for new tools...")
@@ -98,21 +253,31 @@ class InfiniteContentEngine:
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
             }
             
-            response = requests.get(self.sources['free_for_dev'], headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = self.http_cache.get(self.sources['free_for_dev'], headers=headers, timeout=10)
+            if response.not_modified:
+                cached_tools = self.http_cache.load_parsed(self.sources['free_for_dev'], 'free_for_dev')
+                if cached_tools is not None:
+                    print(f"♻️ free-for.dev unchanged (304) - reusing {len(cached_tools)} parsed tools")
+                    return cached_tools
+            if response.status_code != 200:
+                # An error page must never replace the tools parsed from the last good response
+                raise RuntimeError(f"HTTP {response.status_code}")
             
-            # Look for AI/automation related sections
-            ai_keywords = ['ai', 'automation', 'machine learning', 'bot', 'workflow', 'api']
+            # Only <a> elements are built - the rest of the page is skipped
+            soup = self.parse_source_html(response.content, 'a', 'free_for_dev')
             
             # Find tool links and descriptions
-            links = soup.find_all('a')
-            for link in links:
-                text = link.get_text().lower()
+            seen_names = set()
+            for link in soup.find_all('a'):
+                link_text = link.get_text()
+                text = link_text.lower()
                 href = link.get('href', '')
                 
-                if any(keyword in text for keyword in ai_keywords) and href:
-                    tool_name = link.get_text().strip()
-                    if len(tool_name) > 3 and tool_name not in [t.name for t in tools]:
+                if href and AI_LINK_KEYWORDS.contains_any(link_text):
+                    tool_name = link_text.strip()
+                    tool_key = canonical_tool_name(tool_name)
+                    if len(tool_name) > 3 and tool_key not in seen_names:
+                        seen_names.add(tool_key)
                         tools.append(AITool(
                             name=tool_name,
                             description=f"Free tier AI/automation tool for {text}",
@@ -126,6 +291,7 @@ class InfiniteContentEngine:
                         if len(tools) >= 20:  # Limit per source
                             break
             
+            self.http_cache.save_parsed(self.sources['free_for_dev'], 'free_for_dev', tools)
             print(f"✅ Found {len(tools)} new tools from free-for.dev")
             return tools
             
@@ -133,6 +299,13 @@ class InfiniteContentEngine:
             print(f"⚠️ Error scraping free-for.dev: {e}")
             return []
     
+    def parse_source_html(self, content, tags, source_name):
+        """Parse only the tags a scraper needs and record parse time / peak memory"""
+        soup, stats = parse_tags(content, tags, source_name, track_memory=self.track_parse_memory)
+        self.parse_stats[source_name] = stats
+        print(f"⏱️ {stats.summary()}")
+        return soup
+    
     def scrape_pareto_ai_tools(self):
         """Scrape AI tools from Pareto blog"""
         print("🔍 Scraping Pareto AI blog for latest tools...")
@@ -143,31 +316,33 @@ class InfiniteContentEngine:
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
             }
             
-            response = requests.get(self.sources['pareto_ai_blog'], headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = self.http_cache.get(self.sources['pareto_ai_blog'], headers=headers, timeout=10)
+            if response.not_modified:
+                cached_tools = self.http_cache.load_parsed(self.sources['pareto_ai_blog'], 'pareto_ai_blog')
+                if cached_tools is not None:
+                    print(f"♻️ Pareto blog unchanged (304) - reusing {len(cached_tools)} parsed tools")
+                    return cached_tools
+            if response.status_code != 200:
+                # An error page must never replace the tools parsed from the last good response
+                raise RuntimeError(f"HTTP {response.status_code}")
             
-            # Extract AI tool mentions from blog content
-            paragraphs = soup.find_all(['p', 'h2', 'h3', 'li'])
+            # Extract AI tool mentions from blog content - only text blocks are built
+            text_tags = ['p', 'h2', 'h3', 'li']
+            soup = self.parse_source_html(response.content, text_tags, 'pareto_ai_blog')
+            paragraphs = soup.find_all(text_tags)
             
-            ai_tools_mentioned = set()
+            # Variants of one tool ("Otter AI", "OtterAI") collapse to one canonical name
+            ai_tools_mentioned = {}
             for p in paragraphs:
                 text = p.get_text()
                 
                 # Look for AI tool patterns
-                tool_patterns = [
-                    r'([A-Z][a-zA-Z]+\.ai)',
-                    r'([A-Z][a-zA-Z]+AI)',
-                    r'(GPT-\d+)',
-                    r'([A-Z][a-zA-Z]+ AI)',
-                ]
-                
-                import re
-                for pattern in tool_patterns:
-                    matches = re.findall(pattern, text)
-                    ai_tools_mentioned.update(matches)
+                for pattern in TOOL_NAME_PATTERNS:
+                    for tool_name in pattern.findall(text):
+                        ai_tools_mentioned.setdefault(canonical_tool_name(tool_name), tool_name)
             
             # Convert to AITool objects
-            for tool_name in list(ai_tools_mentioned)[:15]:  # Limit to 15
+            for tool_name in list(ai_tools_mentioned.values())[:15]:  # Limit to 15
                 if len(tool_name) > 3:
                     tools.append(AITool(
                         name=tool_name,
@@ -179,6 +354,7 @@ class InfiniteContentEngine:
                         income_potential=random.choice(['$1.2K/month', '$2.8K/month', '$1.8K/month', '$3.5K/month'])
                     ))
             
+            self.http_cache.save_parsed(self.sources['pareto_ai_blog'], 'pareto_ai_blog', tools)
             print(f"✅ Found {len(tools)} AI tools from Pareto blog")
             return tools
             
@@ -201,6 +377,7 @@ class InfiniteContentEngine:
         """Scrape additional AI tool directories"""
         print("🔍 Scraping additional AI directories...")
         all_tools = []
+        rng = random.Random()
         
         # Simulate discovering tools (in real implementation, would scrape)
         discovered_tools = [
@@ -212,69 +389,192 @@ class InfiniteContentEngine:
         ]
         
         for tool in discovered_tools:
+            # Seed per tool so every rebuild produces the same attributes
+            rng.seed(tool)
             all_tools.append(AITool(
                 name=tool,
                 description=f"Professional automation platform for modern businesses",
-                category=random.choice(["productivity", "automation", "design", "marketing"]),
+                category=rng.choice(["productivity", "automation", "design", "marketing"]),
                 url=f"https://{tool.lower().replace('.', '')}.com",
-                pricing=random.choice(["$39/month", "$67/month", "$29/month", "Free + Paid tiers"]),
+                pricing=rng.choice(["$39/month", "$67/month", "$29/month", "Free + Paid tiers"]),
                 use_case=self.generate_use_case(tool),
-                income_potential=random.choice(['$1.5K/month', '$2.2K/month', '$3.8K/month', '$1.8K/month'])
+                income_potential=rng.choice(['$1.5K/month', '$2.2K/month', '$3.8K/month', '$1.8K/month'])
             ))
         
         print(f"✅ Added {len(all_tools)} tools from directories")
         return all_tools
     
-    def update_ai_tools_database(self):
-        """Update database with fresh AI tools from all sources"""
-        print("🔄 Updating AI tools database...")
+    def crawl_ai_directories(self):
+        """Crawl theresanaiforthat, futurepedia, aitoolnet, toolify and Product Hunt listings"""
+        print("🕸️ Crawling AI tool directories...")
+        self.crawl_done = True
+        try:
+            # Stop early enough to hand results back before the source timeout
+            time_budget = self.source_timeouts.get('directory_crawl', self.source_timeout) - 15
+            records_by_source = self.directory_crawler.crawl(self.tool_store.known_names, time_budget)
+        except Exception as e:
+            print(f"⚠️ Error crawling AI directories: {e}")
+            return []
         
-        # Check if we need to update (daily refresh)
-        cache_age = self.get_cache_age()
-        if cache_age < 24:  # Less than 24 hours old
-            if os.path.exists(self.tools_cache):
-                with open(self.tools_cache, 'rb') as f:
-                    self.ai_tools_db = pickle.load(f)
-                print(f"📚 Loaded {len(self.ai_tools_db)} tools from cache")
-                return
+        tools = [self.directory_record_to_tool(record)
+                 for records in records_by_source.values() for record in records]
+        print(f"✅ Crawled {len(tools)} tools from {len(records_by_source)} directories")
+        return tools
+    
+    def directory_record_to_tool(self, record):
+        """Turn a crawled listing entry into an AITool"""
+        # Seed per tool so every recrawl produces the same attributes
+        rng = random.Random(record['name'])
+        return AITool(
+            name=record['name'],
+            description=record.get('description') or "AI tool for automation and content creation",
+            category=record.get('category') or "ai_tools",
+            url=record.get('url') or "",
+            pricing=rng.choice(["Free + Premium", "$19/month", "$29/month", "$49/month", "Free tier available"]),
+            use_case=self.generate_use_case(record['name']),
+            income_potential=rng.choice(['$1.2K/month', '$1.8K/month', '$2.5K/month', '$3K/month'])
+        )
+    
+    @property
+    def ai_tools_db(self):
+        """Full tool catalogue as a list (full table scan - prefer tool_store queries)"""
+        return self.tool_store.all_tools()
+    
+    def import_legacy_tools_cache(self):
+        """Move tools from the old pickle cache into the tool store once"""
+        if self.tool_store.count() or not os.path.exists(self.legacy_tools_cache):
+            return
+        try:
+            with open(self.legacy_tools_cache, 'rb') as f:
+                legacy_tools = pickle.load(f)
+            self.tool_store.upsert_tools(legacy_tools, 'legacy_cache')
+            print(f"📦 Imported {len(legacy_tools)} tools from legacy pickle cache")
+        except Exception as e:
+            print(f"⚠️ Legacy cache import error: {e}")
+    
+    def migrate_used_tools(self):
+        """Replay the old used_tools list into the rotation queue and drop it from memory"""
+        used_tools = self.content_history.pop('used_tools', None)
+        if used_tools:
+            self.tool_store.mark_used(list(dict.fromkeys(used_tools)))
+            print(f"📦 Moved {len(used_tools)} used tools into the rotation queue")
+            self.compact_memory()
+    
+    def update_ai_tools_database(self, force=False, crawl=False):
+        """Refresh stale sources and merge their tools into the catalogue (crawl=True includes the directory crawl)"""
+        print("🔄 Updating AI tools database...")
         
-        # Refresh from all sources
-        all_tools = []
+        # Only sources past their own refresh interval are scraped
+        stale_sources = self.get_stale_sources(force, crawl)
+        if not stale_sources:
+            print(f"📚 {self.tool_store.count()} tools available in tool store")
+            return
         
-        # Source 1: free-for.dev
-        all_tools.extend(self.scrape_free_for_dev_tools())
-        time.sleep(2)  # Be respectful
+        print(f"🔁 Refreshing stale sources: {', '.join(stale_sources)}")
+        if self.concurrent_refresh:
+            tools_by_source = self.scrape_all_sources_concurrently(stale_sources)
+        else:
+            tools_by_source = self.scrape_all_sources_sequentially(stale_sources)
         
-        # Source 2: Pareto blog
-        all_tools.extend(self.scrape_pareto_ai_tools())
-        time.sleep(2)
+        # Merge incrementally - known tools keep their identity, new ones are added
+        new_tools = 0
+        for source_name, tools in tools_by_source.items():
+            added = self.tool_store.upsert_tools(tools, source_name)
+            new_tools += added
+            # An empty result usually means the scrape failed, so retry next run
+            if tools:
+                self.tool_store.set_source_refresh(source_name, len(tools))
+            else:
+                self.failed_sources.add(source_name)
+            print(f"🧩 {source_name}: {added} new of {len(tools)} scraped")
         
-        # Source 3: Additional directories
-        all_tools.extend(self.scrape_additional_ai_directories())
+        # Sources that raised or missed their deadline are not waited on again in this process either
+        self.failed_sources.update(source_name for source_name in stale_sources if source_name not in tools_by_source)
         
-        # Remove duplicates
-        seen_names = set()
-        unique_tools = []
-        for tool in all_tools:
-            if tool.name not in seen_names:
-                unique_tools.append(tool)
-                seen_names.add(tool.name)
+        print(f"🎉 Updated database: {new_tools} new, {self.tool_store.count()} unique AI tools")
+    
+    def get_stale_sources(self, force=False, crawl=False):
+        """Sources whose refresh interval has elapsed"""
+        source_names = [source_name for source_name in self.get_tool_scrapers()
+                        if source_name not in self.crawl_sources or (crawl and not self.crawl_done)]
+        if force or not self.tool_store.count():
+            return source_names
+        return [
+            source_name for source_name in source_names
+            if source_name not in self.failed_sources
+            and (self.get_source_age(source_name) >= self.source_refresh_hours.get(source_name, 24)
+                 or self.source_has_unfinished_crawl(source_name))
+        ]
+    
+    def source_has_unfinished_crawl(self, source_name):
+        """An interrupted directory crawl resumes on the next run instead of waiting for its TTL"""
+        return source_name == 'directory_crawl' and self.directory_crawler.has_unfinished_pass()
+    
+    def get_tool_scrapers(self):
+        """Map each tool source to the method that scrapes it"""
+        return {
+            'free_for_dev': self.scrape_free_for_dev_tools,
+            'pareto_ai_blog': self.scrape_pareto_ai_tools,
+            'ai_tool_directories': self.scrape_additional_ai_directories,
+            'directory_crawl': self.crawl_ai_directories
+        }
+    
+    def scrape_all_sources_sequentially(self, source_names=None):
+        """Scrape every source one after another (legacy refresh mode)"""
+        tools_by_source = {}
+        scrapers = [(name, scraper) for name, scraper in self.get_tool_scrapers().items()
+                    if source_names is None or name in source_names]
+        # Spacing between requests to the same domain comes from the fetch scheduler
+        for source_name, scraper in scrapers:
+            tools_by_source[source_name] = scraper()
+        return tools_by_source
+    
+    def scrape_all_sources_concurrently(self, source_names=None):
+        """Scrape every source in parallel, merging results as each one finishes"""
+        scrapers = {name: scraper for name, scraper in self.get_tool_scrapers().items()
+                    if source_names is None or name in source_names}
+        tools_by_source = {}
         
-        self.ai_tools_db = unique_tools
+        # Not used as a context manager: exiting it would wait for hung scrapers
+        executor = ThreadPoolExecutor(max_workers=len(scrapers))
+        futures = {executor.submit(scraper): name for name, scraper in scrapers.items()}
         
-        # Cache the results
-        with open(self.tools_cache, 'wb') as f:
-            pickle.dump(self.ai_tools_db, f)
+        # Every source starts at once, so each gets its own deadline from now
+        started = time.monotonic()
+        deadlines = {future: started + self.source_timeouts.get(name, self.source_timeout)
+                     for future, name in futures.items()}
+        pending = set(futures)
+        try:
+            while pending:
+                wait_seconds = max(0, min(deadlines[future] for future in pending) - time.monotonic())
+                done, _ = wait(pending, timeout=wait_seconds, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    source_name = futures[future]
+                    try:
+                        tools = future.result()
+                        tools_by_source[source_name] = tools
+                        print(f"📥 Merged {len(tools)} tools from {source_name}")
+                    except Exception as e:
+                        print(f"⚠️ Source {source_name} failed: {e}")
+                
+                now = time.monotonic()
+                for future in [future for future in pending if deadlines[future] <= now]:
+                    pending.discard(future)
+                    source_name = futures[future]
+                    print(f"⏱️ Skipping {source_name}: exceeded "
+                          f"{self.source_timeouts.get(source_name, self.source_timeout)}s")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
         
-        print(f"🎉 Updated database with {len(self.ai_tools_db)} unique AI tools")
+        return tools_by_source
     
-    def get_cache_age(self):
-        """Get age of tools cache in hours"""
+    def get_source_age(self, source_name):
+        """Get hours since a source was last refreshed"""
         try:
-            if os.path.exists(self.tools_cache):
-                cache_time = os.path.getmtime(self.tools_cache)
-                age_hours = (time.time() - cache_time) / 3600
-                return age_hours
+            last_refresh = self.tool_store.get_source_refresh(source_name)
+            if last_refresh:
+                return (time.time() - last_refresh) / 3600
         except:
             pass
         return 999  # Very old, needs refresh
@@ -299,7 +599,9 @@ class InfiniteContentEngine:
                               "Generate Revenue", "Save 10+ Hours/Week"],
                     "market_timing": ["AI adoption is at tipping point", "Competition is still low",
                                     "Technology just reached reliability threshold", "Market demand is exploding"]
-                }
+                },
+                context_fields=["tool_name", "description", "income_potential", "pricing",
+                                "implementation_steps", "pro_tip", "date"]
             ),
             ContentTemplate(
                 template_type="combo_strategy",
@@ -321,7 +623,8 @@ class InfiniteContentEngine:
                         "Combine visual creation with systematic marketing",
                         "Merge data automation with customer acquisition"
                     ]
-                }
+                },
+                context_fields=["tool1", "tool2", "combo_steps", "synergy_explanation", "date"]
             ),
             ContentTemplate(
                 template_type="opportunity_analysis",
@@ -342,109 +645,242 @@ class InfiniteContentEngine:
                                   "High demand, low competition", "Perfect timing for early adopters"],
                     "revenue_model": ["Subscription automation services", "Content-as-a-Service model",
                                     "Automated affiliate income", "SaaS tool reselling"]
-                }
+                },
+                context_fields=["tool_name", "implementation", "timing_analysis", "action_steps", "date"]
             )
         ]
     
+    def get_compiled_template(self, template):
+        """Compiled form of a template, compiling on the fly if it was not loaded at startup"""
+        compiled = self.compiled_templates.get(template.template_type)
+        if compiled is None or compiled.template is not template:
+            compiled = CompiledTemplate(template)
+        return compiled
+    
     def is_content_unique(self, content):
-        """Check if content is unique using hash comparison"""
-        content_hash = hashlib.md5(content.encode()).hexdigest()
-        
-        if content_hash in self.content_history.get('posted_content_hashes', []):
-            return False
-        
-        # Add to history
-        if 'posted_content_hashes' not in self.content_history:
-            self.content_history['posted_content_hashes'] = []
-        
-        self.content_history['posted_content_hashes'].append(content_hash)
-        
-        # Keep only last 100 hashes to prevent memory bloat
-        if len(self.content_history['posted_content_hashes']) > 100:
-            self.content_history['posted_content_hashes'] = self.content_history['posted_content_hashes'][-100:]
-        
-        return True
+        """Check if content is unique against the full posting history"""
+        return self.content_index.check_and_add(content)
     
     def generate_infinite_content(self):
         """Generate completely unique content that never repeats"""
-        print("🎨 Generating infinite unique content...")
-        
-        # Update tools database
-        self.update_ai_tools_database()
-        
-        # Select random template
-        template = random.choice(self.templates)
-        
-        # Select tools that haven't been used recently
-        available_tools = self.get_fresh_tools()
-        
-        if len(available_tools) < 2:
-            print("⚠️ Low tool variety, refreshing database...")
-            self.ai_tools_db = []  # Force refresh
+        with self.generation_lock:
+            print("🎨 Generating infinite unique content...")
+            
+            # Update tools database
             self.update_ai_tools_database()
+            
+            # Select random template
+            template = random.choice(self.templates)
+            
+            # Select tools that haven't been used recently
             available_tools = self.get_fresh_tools()
-        
-        # Generate content based on template
-        if template.template_type == "tool_spotlight":
-            return self.generate_tool_spotlight(template, available_tools)
-        elif template.template_type == "combo_strategy":
+            
+            if len(available_tools) < 2:
+                print("⚠️ Low tool variety, refreshing database...")
+                self.update_ai_tools_database(force=True)
+                available_tools = self.get_fresh_tools()
+            
+            # Candidates are only rendered here; history, tool rotation and memory change once one is accepted
+            candidate = None
+            for attempt in range(self.max_generation_attempts):
+                title, content, tools, template_type = self.render_candidate(template, available_tools)
+                
+                if self.content_index.contains_digest(hashlib.md5(content.encode()).digest()):
+                    print("♻️ Exact duplicate of a previous post, regenerating...")
+                else:
+                    candidate = (title, content, tools, template_type)
+                    similarity = self.content_similarity(content)
+                    if similarity < self.near_duplicate_threshold:
+                        return self.commit_post(*candidate)
+                    print(f"♻️ Near-duplicate of a previous post ({similarity:.0%} similar), regenerating...")
+                
+                template = random.choice(self.templates)
+                available_tools = self.get_fresh_tools()
+            
+            if candidate is None:
+                raise RuntimeError(f"No unique content after {self.max_generation_attempts} attempts")
+            
+            print(f"⚠️ No distinct content after {self.max_generation_attempts} attempts, using last candidate")
+            return self.commit_post(*candidate)
+    
+    def render_candidate(self, template, available_tools):
+        """Render a post for a template as (title, content, tools, template_type)"""
+        if template.template_type == "combo_strategy":
             return self.generate_combo_strategy(template, available_tools)
-        elif template.template_type == "opportunity_analysis":
+        if template.template_type == "opportunity_analysis":
             return self.generate_opportunity_analysis(template, available_tools)
-        
-        # Fallback
+        # Tool spotlight, and the fallback for unknown templates
         return self.generate_tool_spotlight(template, available_tools)
     
-    def get_fresh_tools(self):
-        """Get tools that haven't been used recently"""
-        used_tools = set(self.content_history.get('used_tools', []))
-        available_tools = [tool for tool in self.ai_tools_db if tool.name not in used_tools]
-        
-        # If we've used all tools, reset the used list
-        if len(available_tools) < 5:
-            self.content_history['used_tools'] = []
-            available_tools = self.ai_tools_db
+    def generate_batch(self, n):
+        """Generate n unique posts with one catalogue load and one memory commit
         
-        return available_tools
+        Posts rotate across the templates and are deduplicated against the
+        posting history and against each other before anything is recorded.
+        Returns a list of (title, content) tuples.
+        """
+        with self.generation_lock:
+            print(f"🎨 Generating batch of {n} unique posts...")
+            self.update_ai_tools_database()
+            
+            # One rotation query for the whole batch, consumed in LRU order
+            window = self.tool_store.next_tools(max(self.fresh_tools_limit, 2 * n))
+            if not window:
+                print("❌ No tools available for batch generation")
+                return []
+            tool_stream = cycle(window)
+            # A combo needs two distinct tools, so a one-tool window skips that template
+            templates = cycle([template for template in self.templates
+                               if template.template_type != "combo_strategy" or len(window) >= 2])
+            today = datetime.now().strftime('%B %d, %Y')
+            
+            # Batch-local LSH index so posts in the batch are compared with each other
+            batch_index = NearDuplicateIndex(None, self.near_duplicate_threshold)
+            batch_digests = set()
+            posts, signatures, used_tools = [], [], []
+            
+            attempts = 0
+            while len(posts) < n and attempts < n * self.max_generation_attempts:
+                attempts += 1
+                template = next(templates)
+                if template.template_type == "combo_strategy":
+                    tools = [next(tool_stream), next(tool_stream)]
+                    title, content = self.render_combo_strategy(template, tools[0], tools[1], today)
+                elif template.template_type == "opportunity_analysis":
+                    tools = [next(tool_stream)]
+                    title, content = self.render_opportunity_analysis(template, tools[0], today)
+                else:
+                    tools = [next(tool_stream)]
+                    title, content = self.render_tool_spotlight(template, tools[0], today)
+                
+                digest = hashlib.md5(content.encode()).digest()
+                if digest in batch_digests or self.content_index.contains_digest(digest):
+                    continue
+                signature = self.near_duplicate_index.signature(content)
+                if (self.near_duplicate_index.is_near_duplicate(content, signature)
+                        or batch_index.is_near_duplicate(content, signature)):
+                    continue
+                
+                batch_digests.add(digest)
+                batch_index.add_signatures([signature])
+                signatures.append(signature)
+                used_tools.extend(tools)
+                self.record_post(content, tools, template.template_type)
+                posts.append((title, content))
+            
+            # Single commit of hashes, signatures, tool rotation and memory
+            if posts:
+                self.content_index.add_digests(list(batch_digests))
+                self.near_duplicate_index.add_signatures(signatures)
+                self.mark_tools_used(list({tool.name: tool for tool in used_tools}.values()))
+                self.save_memory()
+            
+            print(f"✅ Generated {len(posts)}/{n} unique posts in {attempts} renders")
+            return posts
     
-    def generate_tool_spotlight(self, template, available_tools):
-        """Generate tool spotlight content"""
-        tool = random.choice(available_tools)
-        today = datetime.now().strftime('%B %d, %Y')
+    def fill_content_pool(self, target_size=None, crawl=False):
+        """Top the content pool up to target_size pre-generated posts (crawl=True also crawls directories first)"""
+        if crawl:
+            self.update_ai_tools_database(crawl=True)
+        target_size = target_size or self.pool_target_size
+        missing = target_size - self.content_pool.count()
+        if missing <= 0:
+            print(f"📦 Content pool already full ({self.content_pool.count()} posts)")
+            return 0
         
-        # Mark tool as used
-        if 'used_tools' not in self.content_history:
-            self.content_history['used_tools'] = []
-        self.content_history['used_tools'].append(tool.name)
-        
-        # Generate variables
-        benefit = random.choice(template.variables['benefit'])
-        market_timing = random.choice(template.variables['market_timing'])
+        # Batch posts are recorded in history now, so they are never generated twice
+        added = self.content_pool.add_posts(self.generate_batch(missing))
+        print(f"📦 Content pool refilled: +{added} posts ({self.content_pool.count()} ready)")
+        return added
+    
+    def refill_content_pool_async(self):
+        """Refill the pool in a background thread unless a refill is already running"""
+        if self.pool_refill_thread and self.pool_refill_thread.is_alive():
+            return self.pool_refill_thread
         
-        title = template.title_pattern.format(
-            tool_name=tool.name,
-            benefit=benefit,
-            date=today
-        )
+        # Not a daemon: a one-shot run waits for the refill before the process exits
+        self.pool_refill_thread = threading.Thread(target=self.run_pool_refill, name="content-pool-refill")
+        self.pool_refill_thread.start()
+        return self.pool_refill_thread
+    
+    def run_pool_refill(self):
+        """Background refill entry point"""
+        try:
+            self.fill_content_pool()
+        except Exception as e:
+            print(f"⚠️ Content pool refill error: {e}")
+    
+    def next_pooled_post(self, refill=True):
+        """Dequeue a ready post, generating one on the spot only if the pool is empty"""
+        pooled = self.content_pool.pop()
+        if pooled is None:
+            print("📦 Content pool empty, generating content now...")
+            post = self.generate_infinite_content()
+        else:
+            title, content, created_at = pooled
+            post = self.refresh_post_date(title, content, created_at)
+            if post[1] != content:
+                # History holds the digest of the text as rendered; record the re-dated text that is posted too
+                with self.generation_lock:
+                    self.content_index.add_digest(hashlib.md5(post[1].encode()).digest())
+            print(f"📦 Using pre-generated post ({self.content_pool.count()} left in pool)")
         
-        # Generate implementation steps
-        implementation_steps = self.generate_implementation_steps(tool)
-        pro_tip = self.generate_pro_tip(tool)
-        
-        content_parts = []
-        for structure in template.content_structure:
-            part = structure.format(
-                tool_name=tool.name,
-                description=tool.description,
-                income_potential=tool.income_potential,
-                pricing=tool.pricing,
-                implementation_steps=implementation_steps,
-                market_timing=market_timing,
-                pro_tip=pro_tip
-            )
-            content_parts.append(part)
+        if refill and self.content_pool.count() < self.pool_low_watermark:
+            self.refill_content_pool_async()
+        return post
+    
+    def refresh_post_date(self, title, content, created_at):
+        """Replace the render date of a pooled post with today's date"""
+        rendered_on = datetime.fromtimestamp(created_at).strftime('%B %d, %Y')
+        today = datetime.now().strftime('%B %d, %Y')
+        if rendered_on == today:
+            return title, content
+        return title.replace(rendered_on, today), content.replace(rendered_on, today)
+    
+    def content_similarity(self, content):
+        """Estimated similarity (0-1) between content and the closest previous post"""
+        return self.near_duplicate_index.max_similarity(content)
+    
+    def is_near_duplicate(self, content):
+        """Check if content reads like a previous post even when the bytes differ"""
+        return self.content_similarity(content) >= self.near_duplicate_threshold
+    
+    def get_fresh_tools(self, category=None):
+        """Get the least recently used tools, optionally from one category"""
+        return self.tool_store.next_tools(self.fresh_tools_limit, category)
+    
+    def mark_tools_used(self, tools):
+        """Record tools featured in a post so they rotate to the back of the queue"""
+        self.tool_store.mark_used([tool.name for tool in tools])
+    
+    def commit_post(self, title, content, tools, template_type):
+        """Record an accepted post: dedup indexes, tool rotation and memory"""
+        self.content_index.check_and_add(content)
+        self.near_duplicate_index.add(content)
+        self.mark_tools_used(tools)
+        self.record_post(content, tools, template_type)
+        self.save_memory()
+        return title, content
+    
+    def generate_tool_spotlight(self, template, available_tools):
+        """Pick a tool and render a tool spotlight candidate (nothing is recorded)"""
+        tool = random.choice(available_tools)
+        title, content = self.render_tool_spotlight(template, tool)
+        return title, content, [tool], template.template_type
+    
+    def render_tool_spotlight(self, template, tool, today=None):
+        """Render tool spotlight title and content without touching history"""
+        today = today or datetime.now().strftime('%B %d, %Y')
         
-        content = '\n\n'.join(content_parts)
+        title, content = self.get_compiled_template(template).render({
+            'tool_name': tool.name,
+            'description': tool.description,
+            'income_potential': tool.income_potential,
+            'pricing': tool.pricing,
+            'implementation_steps': self.generate_implementation_steps(tool),
+            'pro_tip': self.generate_pro_tip(tool),
+            'date': today
+        })
         
         # Add unique elements
         content += f"\n\n**🔥 Current Opportunity:**\n{self.generate_current_opportunity(tool)}"
@@ -454,55 +890,28 @@ class InfiniteContentEngine:
         content += f"\n📱 Community: {os.getenv('INSTAGRAM_CONSULTING', 'https://instagram.com/jmichaeloficial')}"
         content += f"\n\n*Building the future of AI education with visual content* 🎨🤖"
         
-        # Verify uniqueness
-        if self.is_content_unique(content):
-            self.save_memory()
-            return title, content
-        else:
-            # If somehow not unique, try again with different tool
-            return self.generate_infinite_content()
+        return title, content
     
     def generate_combo_strategy(self, template, available_tools):
-        """Generate combination strategy content"""
+        """Pick two tools and render a combo strategy candidate (nothing is recorded)"""
         if len(available_tools) < 2:
-            return self.generate_tool_spotlight(template, available_tools)
+            return self.generate_tool_spotlight(self.compiled_templates['tool_spotlight'].template, available_tools)
         
         tool1, tool2 = random.sample(available_tools, 2)
-        today = datetime.now().strftime('%B %d, %Y')
-        
-        # Mark tools as used
-        if 'used_tools' not in self.content_history:
-            self.content_history['used_tools'] = []
-        self.content_history['used_tools'].extend([tool1.name, tool2.name])
-        
-        income = random.choice(template.variables['income'])
-        setup_time = random.choice(template.variables['setup_time'])
-        strategy = random.choice(template.variables['strategy_description'])
-        
-        title = template.title_pattern.format(
-            tool1=tool1.name,
-            tool2=tool2.name,
-            income=income,
-            date=today
-        )
-        
-        combo_steps = self.generate_combo_steps(tool1, tool2)
-        synergy = self.generate_synergy_explanation(tool1, tool2)
-        
-        content_parts = []
-        for structure in template.content_structure:
-            part = structure.format(
-                tool1=tool1.name,
-                tool2=tool2.name,
-                income=income,
-                setup_time=setup_time,
-                strategy_description=strategy,
-                combo_steps=combo_steps,
-                synergy_explanation=synergy
-            )
-            content_parts.append(part)
+        title, content = self.render_combo_strategy(template, tool1, tool2)
+        return title, content, [tool1, tool2], template.template_type
+    
+    def render_combo_strategy(self, template, tool1, tool2, today=None):
+        """Render combination strategy title and content without touching history"""
+        today = today or datetime.now().strftime('%B %d, %Y')
         
-        content = '\n\n'.join(content_parts)
+        title, content = self.get_compiled_template(template).render({
+            'tool1': tool1.name,
+            'tool2': tool2.name,
+            'combo_steps': self.generate_combo_steps(tool1, tool2),
+            'synergy_explanation': self.generate_synergy_explanation(tool1, tool2),
+            'date': today
+        })
         content += f"\n\n**🎯 Implementation Timeline:**\n{self.generate_timeline(tool1, tool2)}"
         content += f"\n\n---\n\n**Need help setting up this combo?**"
         content += f"\nOur AI Education community provides complete {tool1.name} + {tool2.name} tutorials."
@@ -510,50 +919,25 @@ class InfiniteContentEngine:
         content += f"\n📱 Community: {os.getenv('INSTAGRAM_CONSULTING', 'https://instagram.com/jmichaeloficial')}"
         content += f"\n\n*Two tools, infinite visual learning possibilities* 🎨🚀"
         
-        if self.is_content_unique(content):
-            self.save_memory()
-            return title, content
-        else:
-            return self.generate_infinite_content()
+        return title, content
     
     def generate_opportunity_analysis(self, template, available_tools):
-        """Generate opportunity analysis content"""
+        """Pick a tool and render an opportunity analysis candidate (nothing is recorded)"""
         tool = random.choice(available_tools)
-        today = datetime.now().strftime('%B %d, %Y')
-        
-        # Mark tool as used
-        if 'used_tools' not in self.content_history:
-            self.content_history['used_tools'] = []
-        self.content_history['used_tools'].append(tool.name)
-        
-        opportunity_type = random.choice(template.variables['opportunity_type'])
-        market_gap = random.choice(template.variables['market_gap'])
-        revenue_model = random.choice(template.variables['revenue_model'])
-        
-        title = template.title_pattern.format(
-            opportunity_type=opportunity_type,
-            tool_name=tool.name,
-            date=today
-        )
-        
-        implementation = self.generate_detailed_implementation(tool)
-        timing_analysis = self.generate_timing_analysis(tool)
-        action_steps = self.generate_action_steps(tool)
-        
-        content_parts = []
-        for structure in template.content_structure:
-            part = structure.format(
-                opportunity_type=opportunity_type,
-                market_gap=market_gap,
-                tool_name=tool.name,
-                revenue_model=revenue_model,
-                implementation=implementation,
-                timing_analysis=timing_analysis,
-                action_steps=action_steps
-            )
-            content_parts.append(part)
+        title, content = self.render_opportunity_analysis(template, tool)
+        return title, content, [tool], template.template_type
+    
+    def render_opportunity_analysis(self, template, tool, today=None):
+        """Render opportunity analysis title and content without touching history"""
+        today = today or datetime.now().strftime('%B %d, %Y')
         
-        content = '\n\n'.join(content_parts)
+        title, content = self.get_compiled_template(template).render({
+            'tool_name': tool.name,
+            'implementation': self.generate_detailed_implementation(tool),
+            'timing_analysis': self.generate_timing_analysis(tool),
+            'action_steps': self.generate_action_steps(tool),
+            'date': today
+        })
         content += f"\n\n**📊 Market Data:**\n{self.generate_market_data(tool)}"
         content += f"\n\n---\n\n**Want to capitalize on this opportunity?**"
         content += f"\nOur AI Education community provides visual tutorials and complete implementation strategies."
@@ -561,11 +945,7 @@ class InfiniteContentEngine:
         content += f"\n📱 Community: {os.getenv('INSTAGRAM_CONSULTING', 'https://instagram.com/jmichaeloficial')}"
         content += f"\n\n*Spotting opportunities with visual learning before they become obvious* 🎨👁️"
         
-        if self.is_content_unique(content):
-            self.save_memory()
-            return title, content
-        else:
-            return self.generate_infinite_content()
+        return title, content
     
     def generate_implementation_steps(self, tool):
         """Generate implementation steps for a tool"""
@@ -662,6 +1042,16 @@ Phase 5: Optimization and Scaling"""
 if __name__ == "__main__":
     engine = InfiniteContentEngine()
     
+    # Pre-generate posts ahead of the scheduled runs
+    if "--fill-pool" in sys.argv:
+        engine.fill_content_pool(crawl=True)
+        sys.exit(0)
+    
+    # Refresh every stale source including the directory crawl
+    if "--crawl" in sys.argv:
+        engine.update_ai_tools_database(crawl=True)
+        sys.exit(0)
+    
     # Generate unique content
     title, content = engine.generate_infinite_content()
     
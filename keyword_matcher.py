@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher - Aho-Corasick multi-pattern matching
+Finds every keyword in a text in a single pass, instead of one substring
+scan per keyword. Matching runs over word tokens, so keywords only match
+on word boundaries ("ai" does not match inside "email"); plurals of a
+keyword's last word match too ("llm" matches "LLMs")
+"""
+
+import re
+from collections import deque
+
+# Words, or single punctuation characters ("make.com" -> make . com)
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize(text):
+    """Lowercase word/punctuation tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def plural_forms(token):
+    """Regular English plurals of a word token ("model" -> "models", "company" -> "companies")"""
+    if not token.isalpha():
+        return []
+    forms = [token + 's', token + 'es']
+    if len(token) > 2 and token.endswith('y') and token[-2] not in 'aeiou':
+        forms.append(token[:-1] + 'ies')
+    return forms
+
+
+class KeywordMatcher:
+    def __init__(self, keywords):
+        """Compile keywords into an Aho-Corasick automaton over tokens
+
+        `keywords` is an iterable of keywords, or a dict mapping each keyword
+        to a group label (or a list of labels) used by group_counts().
+        """
+        if isinstance(keywords, dict):
+            items = keywords.items()
+        else:
+            items = ((keyword, ()) for keyword in keywords)
+
+        self.keywords = []
+        self.keyword_groups = []
+        self.groups = []
+        positions = {}
+        for keyword, groups in items:
+            keyword = keyword.lower()
+            groups = [groups] if isinstance(groups, str) else list(groups)
+            for group in groups:
+                if group not in self.groups:
+                    self.groups.append(group)
+            if keyword in positions:
+                self.keyword_groups[positions[keyword]].extend(groups)
+                continue
+            positions[keyword] = len(self.keywords)
+            self.keywords.append(keyword)
+            self.keyword_groups.append(groups)
+
+        # Trie: goto[node] maps token -> child node, out[node] lists keyword indexes ending here
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        exact = {tuple(tokenize(keyword)) for keyword in self.keywords}
+        for index, keyword in enumerate(self.keywords):
+            tokens = tokenize(keyword)
+            self.add_path(tokens, index)
+            # A plural that is itself a keyword ("new" / "news") stays that keyword only
+            for plural in plural_forms(tokens[-1]) if tokens else []:
+                variant = tuple(tokens[:-1]) + (plural,)
+                if variant not in exact:
+                    self.add_path(variant, index)
+
+        # Failure links by breadth-first search; outputs inherit from their fail node
+        queue = deque(self.goto[0].values())  # Depth-1 nodes fail back to the root
+        while queue:
+            node = queue.popleft()
+            for token, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def add_path(self, tokens, index):
+        """Insert a token sequence into the trie as an occurrence of keyword `index`"""
+        node = 0
+        for token in tokens:
+            child = self.goto[node].get(token)
+            if child is None:
+                child = len(self.goto)
+                self.goto[node][token] = child
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            node = child
+        if index not in self.out[node]:
+            self.out[node].append(index)
+
+    @classmethod
+    def from_groups(cls, groups):
+        """Build a matcher from {group: [keywords]}"""
+        mapping = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                mapping.setdefault(keyword, []).append(group)
+        matcher = cls(mapping)
+        matcher.groups = list(groups)  # Keep the caller's group order for group_counts()
+        return matcher
+
+    def iter_matches(self, text):
+        """Yield the index of every keyword occurrence in one pass over the text"""
+        goto, fail, out = self.goto, self.fail, self.out
+        root = goto[0]
+        node = 0
+        for token in tokenize(text):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0) if node else root.get(token, 0)
+            if out[node]:
+                yield from out[node]
+
+    def find_all(self, text):
+        """Distinct keywords present in the text, in the order they were given"""
+        found = set(self.iter_matches(text))
+        return [keyword for index, keyword in enumerate(self.keywords) if index in found]
+
+    def group_counts(self, text):
+        """Number of distinct keywords found per group, for groups with at least one hit"""
+        counts = {}
+        for index in set(self.iter_matches(text)):
+            for group in self.keyword_groups[index]:
+                counts[group] = counts.get(group, 0) + 1
+        return {group: counts[group] for group in self.groups if group in counts}
+
+    def contains_any(self, text):
+        """True as soon as any keyword is found"""
+        for _ in self.iter_matches(text):
+            return True
+        return False
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Memory Journal - Append-only event log with periodic snapshot compaction
+Each save appends only the new events; the snapshot is rewritten atomically
+every `compact_every` events, so writes cost O(event) instead of O(history)
+"""
+
+import json
+import os
+
+
+class MemoryJournal:
+    def __init__(self, snapshot_path, journal_path, compact_every=500):
+        """Set up snapshot + journal file pair"""
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compact_every = compact_every
+        self.last_seq = 0
+        self.journal_events = 0
+
+    def load(self, default_state, apply_event):
+        """Load the snapshot and replay journal events newer than it"""
+        state = default_state
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as f:
+                state = json.load(f)
+            snapshot_seq = state.pop('_journal_seq', 0)
+        self.last_seq = snapshot_seq
+
+        if os.path.exists(self.journal_path):
+            valid_bytes = 0
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    # A torn write from a crash ends the usable journal
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        break
+                    valid_bytes += len(line)
+                    self.journal_events += 1
+                    # Events already folded into the snapshot are skipped
+                    if event['seq'] > snapshot_seq:
+                        apply_event(state, event)
+                        self.last_seq = event['seq']
+
+            if valid_bytes != os.path.getsize(self.journal_path):
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(valid_bytes)
+
+        return state
+
+    def append(self, events):
+        """Durably append events to the journal"""
+        if not events:
+            return
+        lines = []
+        for event in events:
+            self.last_seq += 1
+            event['seq'] = self.last_seq
+            lines.append(json.dumps(event, separators=(',', ':')) + '\n')
+        with open(self.journal_path, 'a') as f:
+            f.write(''.join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_events += len(events)
+
+    def should_compact(self):
+        """True once the journal has grown past the compaction threshold"""
+        return self.journal_events >= self.compact_every
+
+    def compact(self, state):
+        """Write a snapshot of state atomically, then empty the journal"""
+        snapshot = dict(state, _journal_seq=self.last_seq)
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        # A crash before this truncate is harmless: replay skips seq <= snapshot seq
+        with open(self.journal_path, 'w'):
+            pass
+        self.journal_events = 0
@@ -20,6 +20,7 @@ except ImportError:
     GOOGLE_CLOUD_AVAILABLE = False
 
 from infinite_content_engine import InfiniteContentEngine
+from keyword_matcher import KeywordMatcher
 from visual_content_engine import VisualContentEngine
 
 class MultiPlatformEngine:
@@ -56,6 +57,11 @@ class MultiPlatformEngine:
             }
         }
         
+        # All industry keywords in one matcher, so classification is a single pass
+        self.industry_matcher = KeywordMatcher.from_groups(
+            {industry: data["keywords"] for industry, data in self.industries.items()}
+        )
+        
         # Initialize Google Cloud Natural Language for content classification
         if GOOGLE_CLOUD_AVAILABLE:
             try:
@@ -94,27 +100,15 @@ class MultiPlatformEngine:
                     request={"document": document, "encoding_type": language_v1.EncodingType.UTF8}
                 )
                 
-                # Extract keywords from entities
-                detected_keywords = []
-                for entity in entities_response.entities:
-                    detected_keywords.append(entity.name.lower())
-                
-                # Add content text keywords
-                content_lower = content.lower()
+                # Extract keywords from entities (separator keeps phrases from spanning entities)
+                detected_keywords = " | ".join(entity.name for entity in entities_response.entities)
+                entity_counts = self.industry_matcher.group_counts(detected_keywords)
+                content_counts = self.industry_matcher.group_counts(content)
                 
-                # Score each industry based on keyword matches
+                # Score each industry: 2 per keyword found in entities, 1 per keyword in the text
                 industry_scores = {}
-                for industry, data in self.industries.items():
-                    score = 0
-                    for keyword in data["keywords"]:
-                        # Check in detected entities
-                        if any(keyword in dk for dk in detected_keywords):
-                            score += 2
-                        # Check in content text
-                        if keyword in content_lower:
-                            score += 1
-                    
-                    industry_scores[industry] = score
+                for industry in self.industries:
+                    industry_scores[industry] = 2 * entity_counts.get(industry, 0) + content_counts.get(industry, 0)
                 
                 # Return industry with highest score
                 best_industry = max(industry_scores, key=industry_scores.get)
@@ -128,16 +122,10 @@ class MultiPlatformEngine:
         
         # Simple keyword fallback when Google Cloud API not available or fails
         print("🔄 Using simple keyword classification")
-        content_lower = content.lower()
+        content_counts = self.industry_matcher.group_counts(content)
         
         # Score each industry based on keyword matches
-        industry_scores = {}
-        for industry, data in self.industries.items():
-            score = 0
-            for keyword in data["keywords"]:
-                if keyword in content_lower:
-                    score += 1
-            industry_scores[industry] = score
+        industry_scores = {industry: content_counts.get(industry, 0) for industry in self.industries}
         
         # Return industry with highest score
         if max(industry_scores.values()) > 0:
@@ -492,6 +480,8 @@ class MultiPlatformEngine:
             
         # Select random tool and convert to visual content format
         selected_tool = random.choice(available_tools)
+        # Rotate it to the back of the queue so the next cycle draws from a different window
+        self.content_engine.mark_tools_used([selected_tool])
         tool_data = {
             "name": selected_tool.name,
             "description": selected_tool.description,
@@ -664,8 +654,8 @@ Platform: Single Telegram Channel + Vertex AI Visual Engine"""
             return self.run_visual_content_cycle()
         else:
             print("📝 Running text content generation...")
-            # Generate base content using existing Infinite Content Engine
-            base_content = self.content_engine.generate_infinite_content()
+            # Take a pre-generated post from the Infinite Content Engine pool
+            base_content = self.content_engine.next_pooled_post()
             
             if base_content:
                 title, content = base_content
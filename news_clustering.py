@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+News Clustering - Collapse the same story posted across subreddits
+Items are grouped when they link to the same canonical URL or their title
+is close, under TF-IDF cosine similarity, to the title that started a story;
+each story is then emitted once with the combined score and comment count
+of all its posts
+"""
+
+import heapq
+import math
+import re
+from collections import defaultdict
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+TITLE_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.\-][a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+    a an and are as at be by for from has have how i in is it its new of on or our that the this
+    to was we what when which who why will with you your just now about after into than over
+""".split())
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'igshid', 'ref', 'ref_src', 'si', 'cmpid')
+
+MOBILE_HOST_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.', 'old.', 'new.')
+
+# Each title term only proposes the stories it most recently started, which bounds the work per item
+MAX_STORIES_PER_TERM = 12
+# The stories with the most similarity found through the postings are then compared in full
+RESCORED_STORIES = 4
+
+
+def canonical_url(url):
+    """Normalised form of a URL for grouping, or '' if it has no host"""
+    try:
+        parts = urlsplit((url or '').strip())
+    except ValueError:
+        return ''
+    host = (parts.hostname or '').lower()
+    for prefix in MOBILE_HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    if not host:
+        return ''
+
+    path = re.sub(r'/(amp/?)?$', '', parts.path)
+    query = sorted((key, value) for key, value in parse_qsl(parts.query)
+                   if not key.lower().startswith(TRACKING_PARAMS))
+
+    if host == 'youtu.be':
+        host, path, query = 'youtube.com', '/watch', [('v', path.strip('/'))]
+    elif host.endswith('reddit.com') and '/comments/' in path:
+        # Crossposts and share links carry different subreddit paths and slugs for the same post
+        post_id = path.split('/comments/', 1)[1].split('/')[0]
+        host, path, query = 'reddit.com', f"/comments/{post_id}", []
+    return f"{host}{path}?{urlencode(query)}" if query else f"{host}{path}"
+
+
+def title_terms(title):
+    """Content terms of a title"""
+    return [term for term in TITLE_TOKEN_PATTERN.findall((title or '').lower()) if term not in STOPWORDS]
+
+
+def tfidf_vectors(titles):
+    """L2-normalised sparse TF-IDF vectors (term -> weight dicts) for a batch of titles"""
+    term_lists = [title_terms(title) for title in titles]
+    document_frequency = defaultdict(int)
+    for terms in term_lists:
+        for term in set(terms):
+            document_frequency[term] += 1
+
+    count = len(titles)
+    vectors = []
+    for terms in term_lists:
+        weights = defaultdict(float)
+        for term in terms:
+            weights[term] += 1.0
+        for term in weights:
+            weights[term] *= math.log((1 + count) / (1 + document_frequency[term])) + 1
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        vectors.append({term: weight / norm for term, weight in weights.items()})
+    return vectors
+
+
+def cluster_stories(news_items, similarity_threshold=0.5):
+    """Group news items into stories (lists of items, in first-seen order)
+
+    Items are assigned in one pass. An item joins the story its canonical URL
+    already belongs to, otherwise the story whose first title (the seed) is
+    most similar to its own, if that reaches the threshold; otherwise it
+    starts a story. Comparing with the seed rather than any member keeps
+    chains of loosely related titles from merging into one story.
+
+    Seeds are indexed by term and postings are capped at MAX_STORIES_PER_TERM.
+    The stories that score highest over the item's postings are then compared
+    with the full seed vector, so a very common term only narrows which
+    stories are considered, not how similar they are.
+    """
+    vectors = tfidf_vectors([item['title'] for item in news_items])
+    stories = []
+    seeds = []
+    story_by_url = {}
+    postings = defaultdict(list)
+
+    for item, vector in zip(news_items, vectors):
+        url = canonical_url(item.get('url'))
+        story = story_by_url.get(url) if url else None
+
+        if story is None:
+            shared = defaultdict(float)
+            for term, weight in vector.items():
+                for candidate in postings[term]:
+                    shared[candidate] += weight * seeds[candidate][term]
+            for candidate in heapq.nlargest(RESCORED_STORIES, shared, key=shared.get):
+                similarity = sum(weight * seeds[candidate].get(term, 0.0) for term, weight in vector.items())
+                if similarity >= similarity_threshold and (story is None or similarity > best):
+                    story, best = candidate, similarity
+
+        if story is None:
+            story = len(stories)
+            stories.append([])
+            seeds.append(vector)
+            for term in vector:
+                posting = postings[term]
+                posting.append(story)
+                if len(posting) > MAX_STORIES_PER_TERM:
+                    del posting[0]
+
+        stories[story].append(item)
+        if url:
+            story_by_url.setdefault(url, story)
+    return stories
+
+
+def merge_story(items):
+    """One representative item for a story, carrying the combined score and comments"""
+    representative = max(items, key=lambda item: (item['score'], item['num_comments']))
+    story = dict(representative)
+    story['score'] = sum(item['score'] for item in items)
+    story['num_comments'] = sum(item['num_comments'] for item in items)
+    story['subreddits'] = list(dict.fromkeys(item['subreddit'] for item in
+                                             sorted(items, key=lambda item: -item['score'])))
+    story['cluster_size'] = len(items)
+    return story
+
+
+def dedupe_stories(news_items, similarity_threshold=0.5):
+    """News items with each cross-posted story collapsed into a single item"""
+    return [merge_story(items) for items in cluster_stories(news_items, similarity_threshold)]
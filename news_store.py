@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+News Store - Local SQLite record of subreddit posts already ingested
+Per-subreddit high-water marks let each scrape fetch only posts newer than
+the last run instead of re-downloading the whole listing, and double as a
+TTL cache: a query whose window is covered by recent ingestion is answered
+without contacting Reddit
+"""
+
+import sqlite3
+import threading
+import time
+
+_shared_stores = {}
+_shared_lock = threading.Lock()
+
+NEWS_FIELDS = ('fullname', 'subreddit', 'title', 'content', 'url', 'score', 'num_comments',
+               'created_utc', 'has_news')
+
+
+class NewsStore:
+    def __init__(self, db_path="/tmp/ai_news_store.db"):
+        """Open (or create) the news database"""
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.lock, self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS items (
+                    fullname TEXT PRIMARY KEY,
+                    subreddit TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    content TEXT,
+                    url TEXT,
+                    score INTEGER NOT NULL,
+                    num_comments INTEGER NOT NULL,
+                    created_utc REAL NOT NULL,
+                    has_news INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_items_created ON items(created_utc);
+                CREATE TABLE IF NOT EXISTS watermarks (
+                    subreddit TEXT PRIMARY KEY,
+                    last_fullname TEXT,
+                    last_created_utc REAL,
+                    covered_since REAL,
+                    oldest_fullname TEXT,
+                    updated_at REAL NOT NULL
+                );
+            """)
+            self.migrate_oldest_fullname()
+
+    def migrate_oldest_fullname(self):
+        """Add the backfill anchor to stores created before it existed"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(watermarks)")}
+        if 'oldest_fullname' not in columns:
+            self.conn.execute("ALTER TABLE watermarks ADD COLUMN oldest_fullname TEXT")
+
+    def watermark(self, subreddit):
+        """High-water mark for a subreddit as a dict, or None if never ingested
+
+        last_fullname/last_created_utc is the newest post seen; every post
+        from covered_since up to it has been through ingestion, and
+        oldest_fullname is where a backfill pass continues paging.
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM watermarks WHERE subreddit = ?", (subreddit,)).fetchone()
+        return dict(row) if row else None
+
+    def covered_subreddits(self, subreddits, since_utc, fresh_after):
+        """Subreddits ingested after fresh_after whose stored history reaches back to since_utc"""
+        with self.lock:
+            rows = self.conn.execute(f"""
+                SELECT subreddit FROM watermarks
+                WHERE subreddit IN ({', '.join('?' * len(subreddits))})
+                  AND covered_since <= ? AND updated_at >= ?
+            """, list(subreddits) + [since_utc, fresh_after]).fetchall()
+        return {row[0] for row in rows}
+
+    def add_items(self, items):
+        """Insert or refresh item dicts with NEWS_FIELDS keys"""
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(f"""
+                INSERT INTO items ({', '.join(NEWS_FIELDS)}, fetched_at)
+                VALUES ({', '.join('?' * len(NEWS_FIELDS))}, ?)
+                ON CONFLICT(fullname) DO UPDATE SET
+                    score = excluded.score,
+                    num_comments = excluded.num_comments,
+                    fetched_at = excluded.fetched_at
+            """, [tuple(item[field] for field in NEWS_FIELDS) + (now,) for item in items])
+        return len(items)
+
+    def set_watermark(self, subreddit, last_fullname, last_created_utc, covered_since, oldest_fullname=None):
+        """Record how far ingestion has got for a subreddit"""
+        with self.lock, self.conn:
+            self.conn.execute("""
+                INSERT INTO watermarks
+                    (subreddit, last_fullname, last_created_utc, covered_since, oldest_fullname, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(subreddit) DO UPDATE SET
+                    last_fullname = excluded.last_fullname,
+                    last_created_utc = excluded.last_created_utc,
+                    covered_since = excluded.covered_since,
+                    oldest_fullname = excluded.oldest_fullname,
+                    updated_at = excluded.updated_at
+            """, (subreddit, last_fullname, last_created_utc, covered_since, oldest_fullname, time.time()))
+
+    def recent_items(self, since_utc, subreddits=None):
+        """Stored items created after since_utc, highest score first"""
+        query = "SELECT * FROM items WHERE created_utc > ?"
+        params = [since_utc]
+        if subreddits is not None:
+            query += f" AND subreddit IN ({', '.join('?' * len(subreddits))})"
+            params += list(subreddits)
+        with self.lock:
+            rows = self.conn.execute(query + " ORDER BY score DESC, created_utc DESC", params).fetchall()
+        return [dict(row) for row in rows]
+
+    def stale_fullnames(self, since_utc, fetched_before, limit=-1):
+        """Up to limit items in the window whose score was last fetched before fetched_before, highest score first"""
+        with self.lock:
+            return [row[0] for row in self.conn.execute(
+                "SELECT fullname FROM items WHERE created_utc > ? AND fetched_at < ? ORDER BY score DESC LIMIT ?",
+                (since_utc, fetched_before, limit))]
+
+    def update_scores(self, scores):
+        """Apply (fullname, score, num_comments) refreshes"""
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "UPDATE items SET score = ?, num_comments = ?, fetched_at = ? WHERE fullname = ?",
+                [(score, num_comments, now, fullname) for fullname, score, num_comments in scores])
+
+    def prune(self, before_utc):
+        """Forget items created before before_utc; returns the number removed"""
+        with self.lock, self.conn:
+            removed = self.conn.execute("DELETE FROM items WHERE created_utc < ?", (before_utc,)).rowcount
+            # Coverage cannot reach further back than what is still stored
+            self.conn.execute("UPDATE watermarks SET covered_since = MAX(covered_since, ?)", (before_utc,))
+        return removed
+
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            self.conn.close()
+
+
+def shared_news_store(db_path="/tmp/ai_news_store.db"):
+    """One NewsStore per database per process, shared by every news consumer"""
+    with _shared_lock:
+        if db_path not in _shared_stores:
+            _shared_stores[db_path] = NewsStore(db_path)
+        return _shared_stores[db_path]
@@ -10,9 +10,17 @@ import json
 import os
 from datetime import datetime, timedelta
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from keyword_matcher import KeywordMatcher
+from fetch_scheduler import TokenBucket
+from news_store import shared_news_store
+from news_clustering import dedupe_stories
+from news_ranking import HotnessRanker
 
 class AINewsAggregator:
-    def __init__(self, reddit_instance):
+    def __init__(self, reddit_instance, news_store=None, ranker=None):
         self.reddit = reddit_instance
         
         # AI/Tech subreddits for news gathering
@@ -28,76 +36,320 @@ class AINewsAggregator:
             "MachineLearningNews"
         ]
         
+        # Concurrent subreddit fetch: bounded workers sharing one Reddit request budget
+        self.fetch_workers = int(os.getenv('NEWS_FETCH_WORKERS', '4'))
+        self.subreddit_timeout = float(os.getenv('NEWS_SUBREDDIT_TIMEOUT', '20'))  # Excludes rate-limit waits
+        self.batch_grace_seconds = 5  # How long past its deadline a subreddit may take to return
+        self.reddit_rate_limiter = TokenBucket(rate=float(os.getenv('REDDIT_REQUESTS_PER_SECOND', '1')),
+                                               capacity=self.fetch_workers)
+        self.listing_page_size = 100  # praw fetches listings in pages of up to 100 posts
+        
+        # Incremental ingestion: posts are stored locally and each run only pages back to the last one seen.
+        # The store is shared by every aggregator in the process (and across processes through its file)
+        self.news_store = news_store or shared_news_store()
+        self.max_new_posts = int(os.getenv('NEWS_MAX_NEW_POSTS', '500'))  # Per subreddit per pass
+        self.hot_posts_limit = int(os.getenv('NEWS_HOT_POSTS', '25'))  # Popular posts checked every run
+        self.news_retention_hours = int(os.getenv('NEWS_RETENTION_HOURS', '168'))
+        self.refresh_scores = os.getenv('NEWS_REFRESH_SCORES', '1') != '0'
+        self.score_refresh_minutes = 30  # Scores of stored posts older than this are re-read before ranking
+        self.score_refresh_limit = int(os.getenv('NEWS_SCORE_REFRESH_LIMIT', '200'))  # Highest stored scores only
+        
+        # Posts of the same story across subreddits (same link or similar titles) are ranked as one
+        self.story_similarity_threshold = float(os.getenv('NEWS_STORY_SIMILARITY', '0.5'))
+        
+        # Any object with rank(news_items, k) -> top k items; ScoreRanker restores plain score order
+        self.news_ranker = ranker or HotnessRanker(half_life_hours=float(os.getenv('NEWS_HALF_LIFE_HOURS', '12')))
+        self.top_stories = 10
+        self.thread_state = threading.local()
+        
         # LLM API for content rewriting (using simple API)
         self.llm_api_url = "https://api.openai.com/v1/chat/completions" # Fallback to local LLM
         
-    def scrape_latest_ai_news(self, hours_back=24, max_posts=20):
-        """Scrape latest AI news from multiple subreddits"""
-        news_items = []
+        # Subreddits ingested within the TTL are served from the news store without contacting Reddit
+        self.news_cache_ttl_minutes = int(os.getenv('NEWS_CACHE_TTL_MINUTES', '90'))
+        
+        # Tech and news indicators compiled into one matcher (single pass per post)
+        self.news_keyword_matcher = KeywordMatcher.from_groups({
+            "tech": [
+                "ai", "artificial intelligence", "machine learning", "openai", "chatgpt",
+                "claude", "gemini", "llm", "gpt", "neural network", "deep learning",
+                "automation", "algorithm", "model", "technology", "breakthrough",
+                "research", "development", "innovation", "release", "update",
+                "announcement", "launch", "startup", "funding", "acquisition"
+            ],
+            "news": [
+                "announced", "released", "launched", "revealed", "discovered",
+                "breakthrough", "new", "latest", "today", "this week", "report",
+                "study", "research", "funding", "investment", "acquired"
+            ]
+        })
+        
+    def scrape_latest_ai_news(self, hours_back=24, max_posts=20, refresh=False):
+        """Scrape latest AI news from multiple subreddits, answered from the news cache where it covers the window"""
         cutoff_time = datetime.now() - timedelta(hours=hours_back)
+        cutoff_utc = cutoff_time.timestamp()
         
-        print(f"Scraping AI news from last {hours_back} hours...")
+        self.news_store.prune(time.time() - self.news_retention_hours * 3600)
+        if refresh:
+            stale_subreddits = list(self.news_subreddits)
+        else:
+            covered = self.news_store.covered_subreddits(
+                self.news_subreddits, cutoff_utc, time.time() - self.news_cache_ttl_minutes * 60)
+            stale_subreddits = [name for name in self.news_subreddits if name not in covered]
         
-        for subreddit_name in self.news_subreddits:
-            try:
-                subreddit = self.reddit.subreddit(subreddit_name)
-                print(f"Checking r/{subreddit_name}...")
-                
-                for post in subreddit.hot(limit=max_posts):
-                    post_time = datetime.fromtimestamp(post.created_utc)
-                    
-                    # Only get recent posts
-                    if post_time > cutoff_time:
-                        # Filter for AI/tech related content
-                        if self.is_tech_news(post):
-                            news_item = {
-                                'title': post.title,
-                                'content': post.selftext[:500] if post.selftext else "",
-                                'url': post.url,
-                                'score': post.score,
-                                'subreddit': subreddit_name,
-                                'created': post_time,
-                                'num_comments': post.num_comments
-                            }
-                            news_items.append(news_item)
-                            
-            except Exception as e:
-                print(f"Error scraping r/{subreddit_name}: {e}")
-                continue
+        if stale_subreddits:
+            print(f"Scraping AI news from last {hours_back} hours "
+                  f"({len(stale_subreddits)}/{len(self.news_subreddits)} subreddits not cached)...")
+            if self.fetch_workers > 1:
+                self.ingest_subreddits_concurrently(stale_subreddits, cutoff_utc)
+            else:
+                for subreddit_name in stale_subreddits:
+                    try:
+                        self.ingest_subreddit(self.reddit, subreddit_name, cutoff_utc)
+                    except Exception as e:
+                        print(f"Error scraping r/{subreddit_name}: {e}")
+            if self.refresh_scores:
+                self.refresh_news_scores(cutoff_utc)
+        else:
+            print(f"♻️ News cache covers the last {hours_back} hours")
+        news_items = dedupe_stories(self.stored_news(cutoff_utc, max_posts), self.story_similarity_threshold)
         
-        # Sort by score and recency
-        news_items.sort(key=lambda x: (x['score'], x['created']), reverse=True)
-        return news_items[:10]  # Top 10 stories
+        return self.news_ranker.rank(news_items, self.top_stories)
     
-    def is_tech_news(self, post):
-        """Determine if post is relevant AI/tech news"""
-        title_lower = post.title.lower()
-        content_lower = post.selftext.lower() if post.selftext else ""
-        combined = f"{title_lower} {content_lower}"
-        
-        # Key indicators of AI/tech news
-        tech_keywords = [
-            "ai", "artificial intelligence", "machine learning", "openai", "chatgpt",
-            "claude", "gemini", "llm", "gpt", "neural network", "deep learning",
-            "automation", "algorithm", "model", "technology", "breakthrough",
-            "research", "development", "innovation", "release", "update",
-            "announcement", "launch", "startup", "funding", "acquisition"
-        ]
+    def ingest_subreddits_concurrently(self, subreddits, cutoff_utc):
+        """Ingest subreddits on a bounded worker pool, reporting each as it completes
         
-        # News indicators
-        news_indicators = [
-            "announced", "released", "launched", "revealed", "discovered",
-            "breakthrough", "new", "latest", "today", "this week", "report",
-            "study", "research", "funding", "investment", "acquired"
-        ]
+        Each subreddit's deadline moves on while it waits for the shared rate
+        limit, so the batch only gives up once every running subreddit is past
+        its own deadline (plus a grace period) and still has not returned.
+        """
+        workers = min(self.fetch_workers, len(subreddits))
+        budgets = {subreddit_name: {} for subreddit_name in subreddits}
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="news-fetch")
+        futures = {
+            executor.submit(self.ingest_subreddit, None, subreddit_name, cutoff_utc, budgets[subreddit_name]):
+                subreddit_name
+            for subreddit_name in subreddits
+        }
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subreddit_name = futures[future]
+                    try:
+                        print(f"Checked r/{subreddit_name}: {future.result()} posts scanned")
+                    except Exception as e:
+                        print(f"Error scraping r/{subreddit_name}: {e}")
+                
+                running = [budgets[futures[future]] for future in pending if 'deadline' in budgets[futures[future]]]
+                now = time.monotonic()
+                if running and all(now > budget['deadline'] + self.batch_grace_seconds for budget in running):
+                    print(f"⚠️ Gave up waiting for r/{', r/'.join(futures[future] for future in pending)}")
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def ingest_subreddit(self, reddit, subreddit_name, cutoff_utc, budget=None):
+        """Store posts newer than the subreddit's high-water mark; returns how many were scanned
+        
+        1. The `new` listing is walked newest first down to the last post seen
+           before, even when the stored history does not reach the cutoff yet.
+        2. If the stored history is short of the cutoff, a backfill pass pages
+           on from the oldest post scanned so far, so a busy subreddit extends
+           its history a little every run instead of rescanning the newest posts.
+        3. One page of `hot` adds popular posts the backfill has not reached.
+        """
+        reddit = reddit or self.worker_reddit()
+        subreddit = reddit.subreddit(subreddit_name)
+        watermark = self.news_store.watermark(subreddit_name) or {}
+        last_fullname = watermark.get('last_fullname')
+        last_created = watermark.get('last_created_utc')
+        covered_since = watermark.get('covered_since')
+        oldest_fullname = watermark.get('oldest_fullname')
+        # The caller may pass a dict to watch the deadline, which grows by every wait for the shared rate limit
+        budget = {} if budget is None else budget
+        budget['deadline'] = time.monotonic() + self.subreddit_timeout
+        
+        items, scanned, newest, oldest, reason = self.scan_listing(
+            subreddit.new(limit=self.max_new_posts), subreddit_name, cutoff_utc, self.max_new_posts, budget,
+            stop_fullname=last_fullname, stop_created=last_created)
+        if reason == 'timeout' and not scanned:
+            return 0  # Nothing learned - leave the watermark (and cache freshness) alone
+        if newest is not None:
+            last_fullname, last_created = newest.name, newest.created_utc
+        if reason in ('cutoff', 'end'):
+            covered_since, oldest_fullname = cutoff_utc, oldest.name if oldest else oldest_fullname
+        elif reason != 'seen':
+            # Stopped at the page limit before reaching the stored history: only the scanned run is contiguous
+            covered_since, oldest_fullname = oldest.created_utc, oldest.name
+        elif covered_since is None:
+            covered_since = last_created
+        
+        if covered_since is not None and covered_since > cutoff_utc and oldest_fullname:
+            older_items, older_scanned, _, older, reason = self.scan_listing(
+                subreddit.new(limit=self.max_new_posts, params={'after': oldest_fullname}),
+                subreddit_name, cutoff_utc, self.max_new_posts, budget)
+            items += older_items
+            scanned += older_scanned
+            if reason in ('cutoff', 'end'):
+                covered_since, oldest_fullname = cutoff_utc, older.name if older else oldest_fullname
+            elif older is not None:
+                covered_since, oldest_fullname = older.created_utc, older.name
+        
+        items += self.scan_hot(subreddit, subreddit_name, cutoff_utc, budget)
+        self.news_store.add_items(items)
+        self.news_store.set_watermark(subreddit_name, last_fullname, last_created, covered_since, oldest_fullname)
+        return scanned
+    
+    def scan_listing(self, listing, subreddit_name, cutoff_utc, limit, budget, stop_fullname=None, stop_created=None):
+        """Walk a newest-first listing down to the cutoff or an already seen post
         
-        has_tech = any(keyword in combined for keyword in tech_keywords)
-        has_news = any(indicator in combined for indicator in news_indicators)
+        Returns (news items, posts scanned, newest post, oldest post, stop reason),
+        where the reason is 'seen', 'cutoff', 'end', 'limit' or 'timeout'.
+        """
+        news_items = []
+        newest = oldest = None
+        for index in range(limit):
+            if not self.take_listing_token(index, budget):
+                print(f"⚠️ r/{subreddit_name} timed out after {index} posts")
+                return news_items, index, newest, oldest, 'timeout'
+            post = next(listing, None)
+            if post is None:
+                return news_items, index, newest, oldest, 'end'
+            if stop_fullname and (post.name == stop_fullname or post.created_utc < stop_created):
+                return news_items, index, newest, oldest, 'seen'
+            if post.created_utc < cutoff_utc:
+                return news_items, index, newest, oldest, 'cutoff'
+            newest = newest or post
+            oldest = post
+            item = self.news_item_from_post(post, subreddit_name)
+            if item:
+                news_items.append(item)
+        return news_items, limit, newest, oldest, 'limit'
+    
+    def scan_hot(self, subreddit, subreddit_name, cutoff_utc, budget):
+        """Tech posts inside the window from the first page of the hot listing"""
+        news_items = []
+        listing = subreddit.hot(limit=self.hot_posts_limit)
+        for index in range(self.hot_posts_limit):
+            if not self.take_listing_token(index, budget):
+                break
+            post = next(listing, None)
+            if post is None:
+                break
+            if post.created_utc >= cutoff_utc:
+                item = self.news_item_from_post(post, subreddit_name)
+                if item:
+                    news_items.append(item)
+        return news_items
+    
+    def take_listing_token(self, index, budget):
+        """Rate-limit each listing page request; False once the subreddit's time is up
         
-        # Must have good engagement (avoid spam)
-        has_engagement = post.score > 10 or post.num_comments > 5
+        The listing fetches lazily, so a token is taken before each page request.
+        The bucket is shared by every worker, and time spent waiting for it
+        does not count against the subreddit's own timeout.
+        """
+        if time.monotonic() > budget['deadline']:
+            return False
+        if index % self.listing_page_size == 0:
+            budget['deadline'] += self.reddit_rate_limiter.acquire()
+        return True
+    
+    def news_item_from_post(self, post, subreddit_name):
+        """Store record for a post, or None if it has no AI/tech keywords (it can never qualify)"""
+        has_tech, has_news = self.news_signals(post.title, post.selftext)
+        if not has_tech:
+            return None
+        return {
+            'fullname': post.name,
+            'subreddit': subreddit_name,
+            'title': post.title,
+            'content': post.selftext[:500] if post.selftext else "",
+            'url': post.url,
+            'score': post.score,
+            'num_comments': post.num_comments,
+            'created_utc': post.created_utc,
+            'has_news': int(has_news)
+        }
+    
+    def refresh_news_scores(self, cutoff_utc):
+        """Re-read score and comments of the likeliest ranking candidates in the window (100 per request)"""
+        fullnames = self.news_store.stale_fullnames(cutoff_utc, time.time() - self.score_refresh_minutes * 60,
+                                                    self.score_refresh_limit)
+        scores = []
+        try:
+            for start in range(0, len(fullnames), self.listing_page_size):
+                self.reddit_rate_limiter.acquire()
+                batch = fullnames[start:start + self.listing_page_size]
+                scores.extend((post.name, post.score, post.num_comments) for post in self.reddit.info(fullnames=batch))
+        except Exception as e:
+            print(f"⚠️ Score refresh error: {e}")
+        self.news_store.update_scores(scores)
+        return len(scores)
+    
+    def stored_news(self, cutoff_utc, max_posts):
+        """News items from the store for the window, at most max_posts per subreddit"""
+        news_items = []
+        per_subreddit = {}
+        for row in self.news_store.recent_items(cutoff_utc, self.news_subreddits):
+            if not self.is_news_candidate(row['has_news'], row['score'], row['num_comments']):
+                continue
+            taken = per_subreddit.get(row['subreddit'], 0)
+            if taken >= max_posts:
+                continue
+            per_subreddit[row['subreddit']] = taken + 1
+            news_items.append({
+                'id': row['fullname'],
+                'title': row['title'],
+                'content': row['content'],
+                'url': row['url'],
+                'score': row['score'],
+                'subreddit': row['subreddit'],
+                'created': datetime.fromtimestamp(row['created_utc']),
+                'num_comments': row['num_comments']
+            })
+        return news_items
+    
+    def worker_reddit(self):
+        """Reddit instance owned by the current worker thread"""
+        reddit = getattr(self.thread_state, 'reddit', None)
+        if reddit is None:
+            reddit = self.clone_reddit()
+            self.thread_state.reddit = reddit
+        return reddit
+    
+    def clone_reddit(self):
+        """Separate praw instance with the same credentials (praw instances are not thread safe)"""
+        try:
+            config = self.reddit.config
+            settings = {name: getattr(config, name, None) for name in
+                        ('client_id', 'client_secret', 'user_agent', 'username', 'password', 'refresh_token')}
+            settings = {name: value for name, value in settings.items()
+                        if value is not None and value is not config.CONFIG_NOT_SET}
+            return praw.Reddit(check_for_async=False, **settings)
+        except Exception as e:
+            print(f"⚠️ Sharing the main Reddit instance across workers: {e}")
+            return self.reddit
+    
+    def is_tech_news(self, post):
+        """Determine if post is relevant AI/tech news"""
+        has_tech, has_news = self.news_signals(post.title, post.selftext)
+        return has_tech and self.is_news_candidate(has_news, post.score, post.num_comments)
+    
+    def news_signals(self, title, selftext):
+        """(has tech keywords, has news keywords) for a post's text"""
+        combined = f"{title} {selftext or ''}"
         
-        return has_tech and (has_news or has_engagement)
+        # Key indicators of AI/tech news and news indicators, matched on word boundaries
+        groups = self.news_keyword_matcher.group_counts(combined)
+        return "tech" in groups, "news" in groups
+    
+    def is_news_candidate(self, has_news, score, num_comments):
+        """A tech post qualifies if it reads like news or has good engagement (avoid spam)"""
+        has_engagement = score > 10 or num_comments > 5
+        return bool(has_news) or has_engagement
     
     def synthesize_news_with_llm(self, news_items):
         """Use LLM to synthesize multiple news items into cohesive post"""
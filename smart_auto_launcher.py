@@ -21,11 +21,17 @@ class SmartAutoLauncher:
         self.max_post_interval = 12 * 60 * 60  # Maximum 12 hours between posts
         self.optimal_hours = [9, 15, 20]  # 9AM, 3PM, 8PM EST
         
+        # Prefetch tools, content pool and news this long before each posting window
+        self.prefetch_lead_minutes = int(os.getenv('PREFETCH_LEAD_MINUTES', '20'))
+        # Widest news window the posting code asks for; every narrower query is served from the news cache
+        self.prefetch_news_hours = 48
+        
         print("🤖 Smart Auto Launcher initialized")
         print(f"📡 Target: {self.render_url}")
         print(f"⏱️  Check interval: {self.check_interval//60} minutes")
         print(f"📅 Posts per day: {self.posts_per_day}")
         print(f"⏰ Optimal hours: {self.optimal_hours}")
+        print(f"🔥 Prefetch lead: {self.prefetch_lead_minutes} minutes")
         print(f"📊 Post interval: {self.min_post_interval//3600}-{self.max_post_interval//3600} hours")
     
     def load_status(self):
@@ -292,6 +298,69 @@ class SmartAutoLauncher:
         print(f"\n📊 Daily summary: {current_posts}/3 posts completed today")
         print(f"🏆 Total posts: {status.get('total_posts', 0)}")
     
+    def next_prefetch_time(self, now=None):
+        """Next moment that is prefetch_lead_minutes before an optimal posting hour"""
+        now = now or datetime.now()
+        lead = timedelta(minutes=self.prefetch_lead_minutes)
+        for day_offset in (0, 1):
+            day = now.date() + timedelta(days=day_offset)
+            for hour in sorted(self.optimal_hours):
+                prefetch_at = datetime(day.year, day.month, day.day, hour) - lead
+                if prefetch_at > now:
+                    return prefetch_at
+        return now + timedelta(days=1)
+    
+    def run_prefetch(self):
+        """Warm the tool catalogue, content pool and news cache of this machine for its next posting run"""
+        print(f"🔥 Prefetching at {datetime.now().strftime('%H:%M:%S')}...")
+        started = time.time()
+        
+        # Imported here so the plain launcher does not need the scraping stack
+        try:
+            from infinite_content_engine import InfiniteContentEngine
+            # A fresh engine each time picks up posts made by other processes since the last prefetch
+            engine = InfiniteContentEngine()
+            engine.fill_content_pool(crawl=True)
+        except Exception as e:
+            print(f"⚠️ Tool/content prefetch error: {e}")
+        
+        if not os.environ.get('REDDIT_CLIENT_ID'):
+            print("⏭️ No Reddit credentials - skipping news prefetch")
+            print(f"✅ Prefetch finished in {time.time() - started:.1f}s")
+            return
+        
+        try:
+            import praw
+            from real_time_news_aggregator import AINewsAggregator
+            reddit = praw.Reddit(
+                client_id=os.environ.get('REDDIT_CLIENT_ID'),
+                client_secret=os.environ.get('REDDIT_CLIENT_SECRET'),
+                user_agent=os.environ.get('REDDIT_USER_AGENT', 'AIAutomationLabs-prefetch')
+            )
+            aggregator = AINewsAggregator(reddit)
+            aggregator.scrape_latest_ai_news(hours_back=self.prefetch_news_hours, refresh=True)
+        except Exception as e:
+            print(f"⚠️ News prefetch error: {e}")
+        
+        print(f"✅ Prefetch finished in {time.time() - started:.1f}s")
+    
+    def run_prefetch_daemon(self):
+        """Sleep until each prefetch window and warm this machine's caches ahead of its posting hours"""
+        print("🔥 Starting prefetch daemon...")
+        print("⚠️  Press Ctrl+C to stop")
+        
+        try:
+            while True:
+                prefetch_at = self.next_prefetch_time()
+                wait_seconds = max(0, (prefetch_at - datetime.now()).total_seconds())
+                print(f"😴 Next prefetch at {prefetch_at.strftime('%Y-%m-%d %H:%M')} "
+                      f"({wait_seconds / 60:.0f} minutes)")
+                time.sleep(wait_seconds)
+                self.run_prefetch()
+                
+        except KeyboardInterrupt:
+            print("\n🛑 Prefetch daemon stopped by user")
+    
     def run_once(self):
         """Run single check (for testing)"""
         print("🧪 Running single smart check...")
@@ -310,11 +379,17 @@ if __name__ == "__main__":
             launcher.run_startup_catchup()
         elif sys.argv[1] == "--catchup":
             launcher.run_startup_catchup()
+        elif sys.argv[1] == "--prefetch":
+            launcher.run_prefetch_daemon()
+        elif sys.argv[1] == "--prefetch-now":
+            launcher.run_prefetch()
         else:
-            print("Usage: python3 smart_auto_launcher.py [--once|--startup|--catchup]")
+            print("Usage: python3 smart_auto_launcher.py [--once|--startup|--catchup|--prefetch|--prefetch-now]")
             print("  --once: Single check")
             print("  --startup: Catch-up mode for computer startup")
             print("  --catchup: Manual catch-up mode")
+            print("  --prefetch: Warm this machine's tools, content pool and news before each posting hour")
+            print("  --prefetch-now: Warm this machine's caches now")
             print("  (no args): Continuous monitoring")
     else:
         launcher.run_continuous()
\ No newline at end of file
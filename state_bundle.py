@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+State Bundle - Export/import all engine state as one versioned archive
+Lets ephemeral CI runners start warm: tool catalogue, HTTP cache, dedup
+history, post memory and content pool are packed after a run and restored
+before the next one
+
+Usage:
+    python state_bundle.py export [bundle.tar.gz] [--include-media]
+    python state_bundle.py import [bundle.tar.gz]
+"""
+
+import fnmatch
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import tarfile
+import tempfile
+import time
+
+BUNDLE_FORMAT = "ai-automation-labs-state"
+BUNDLE_VERSION = 1
+DEFAULT_BUNDLE = "state_bundle.tar.gz"
+STATE_ROOT = "/tmp"
+
+# Only these paths (relative to STATE_ROOT) are ever bundled or restored,
+# so credentials written to /tmp by the workflows never end up in a bundle
+SQLITE_FILES = [
+    "ai_tools.db",
+    "reddit_bot_content_pool.db",
+    "ai_directory_crawl.db",
+    "ai_news_store.db",
+]
+STATE_FILES = [
+    "reddit_bot_memory.json",
+    "reddit_bot_memory.journal",
+    "reddit_bot_hashes.bin",
+    "reddit_bot_minhash.bin",
+    "reddit_bot_status.json",
+    "ai_tools_cache.pkl",
+]
+STATE_DIRS = [
+    "ai_tools_http_cache",
+]
+MEDIA_PATTERNS = ["*.mp4", "*.png"]
+
+
+def sha256_file(path):
+    """Hex SHA-256 of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_sqlite(path, dest_path):
+    """Consistent copy of a live SQLite database (includes pages still in the WAL)"""
+    source = sqlite3.connect(path)
+    dest = sqlite3.connect(dest_path)
+    try:
+        source.backup(dest)
+    finally:
+        dest.close()
+        source.close()
+
+
+def collect_state_files(root=STATE_ROOT, include_media=False):
+    """(relative path, kind) for every state file that exists"""
+    entries = [(name, 'sqlite') for name in SQLITE_FILES if os.path.isfile(os.path.join(root, name))]
+    entries += [(name, 'file') for name in STATE_FILES if os.path.isfile(os.path.join(root, name))]
+    for directory in STATE_DIRS:
+        base = os.path.join(root, directory)
+        if not os.path.isdir(base):
+            continue
+        for dirpath, _, filenames in os.walk(base):
+            for filename in sorted(filenames):
+                if '.tmp' in filename:  # Half-written atomic writes
+                    continue
+                entries.append((os.path.relpath(os.path.join(dirpath, filename), root), 'file'))
+    if include_media:
+        for filename in sorted(os.listdir(root)):
+            if os.path.isfile(os.path.join(root, filename)) and any(
+                    fnmatch.fnmatch(filename, pattern) for pattern in MEDIA_PATTERNS):
+                entries.append((filename, 'media'))
+    return entries
+
+
+def export_state(bundle_path=DEFAULT_BUNDLE, root=STATE_ROOT, include_media=False):
+    """Pack all state into a compressed bundle; returns the manifest"""
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'version': BUNDLE_VERSION,
+        'created_at': time.time(),
+        'include_media': include_media,
+        'files': []
+    }
+    tmp_bundle = f"{bundle_path}.tmp"
+    with tempfile.TemporaryDirectory() as workdir, tarfile.open(tmp_bundle, 'w:gz') as tar:
+        for relpath, kind in collect_state_files(root, include_media):
+            path = os.path.join(root, relpath)
+            try:
+                if kind == 'sqlite':
+                    source_path = os.path.join(workdir, os.path.basename(relpath))
+                    snapshot_sqlite(path, source_path)
+                else:
+                    source_path = path
+                checksum = sha256_file(source_path)
+                tar.add(source_path, arcname=f"state/{relpath}", recursive=False)
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️ Skipping {relpath}: {e}")
+                continue
+            manifest['files'].append({
+                'path': relpath,
+                'kind': kind,
+                'size': os.path.getsize(source_path),
+                'sha256': checksum
+            })
+
+        data = json.dumps(manifest, indent=2).encode()
+        info = tarfile.TarInfo('manifest.json')
+        info.size = len(data)
+        info.mtime = int(manifest['created_at'])
+        tar.addfile(info, io.BytesIO(data))
+    os.replace(tmp_bundle, bundle_path)
+
+    total = sum(entry['size'] for entry in manifest['files'])
+    print(f"📦 Exported {len(manifest['files'])} state files ({total / 1024 / 1024:.1f} MB) "
+          f"to {bundle_path} ({os.path.getsize(bundle_path) / 1024 / 1024:.1f} MB compressed)")
+    return manifest
+
+
+def import_state(bundle_path=DEFAULT_BUNDLE, root=STATE_ROOT):
+    """Restore state from a bundle; returns the number of files restored
+
+    Every file is checked against its manifest checksum before it replaces
+    anything, and only paths the bundle format knows about are written.
+    A truncated or corrupt bundle is logged and the run starts cold.
+    """
+    try:
+        return restore_bundle(bundle_path, os.path.realpath(root))
+    except (tarfile.TarError, OSError, EOFError, KeyError, ValueError) as e:
+        print(f"⚠️ Unreadable state bundle {bundle_path} ({e}) - starting cold")
+        return 0
+
+
+def restore_bundle(bundle_path, root):
+    """Restore every verified file of a bundle into root"""
+    with tarfile.open(bundle_path, 'r:gz') as tar:
+        manifest = json.load(tar.extractfile('manifest.json'))
+        if manifest.get('format') != BUNDLE_FORMAT:
+            raise ValueError(f"{bundle_path} is not a state bundle")
+        if manifest.get('version', 0) > BUNDLE_VERSION:
+            raise ValueError(f"Bundle version {manifest['version']} is newer than supported ({BUNDLE_VERSION})")
+
+        restored = 0
+        for entry in manifest['files']:
+            relpath = entry['path']
+            dest = os.path.realpath(os.path.join(root, relpath))
+            if not is_known_state_path(relpath, entry['kind']) or not dest.startswith(root + os.sep):
+                print(f"⚠️ Ignoring unexpected path in bundle: {relpath}")
+                continue
+
+            member = tar.extractfile(f"state/{relpath}")
+            if member is None:
+                print(f"⚠️ Missing from bundle: {relpath}")
+                continue
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            tmp_path = f"{dest}.restore.{os.getpid()}"
+            digest = hashlib.sha256()
+            try:
+                with open(tmp_path, 'wb') as f:
+                    for chunk in iter(lambda: member.read(1 << 20), b''):
+                        digest.update(chunk)
+                        f.write(chunk)
+            except BaseException:
+                os.remove(tmp_path)  # The archive ended mid-file
+                raise
+            if digest.hexdigest() != entry['sha256']:
+                os.remove(tmp_path)
+                print(f"⚠️ Checksum mismatch, not restoring {relpath}")
+                continue
+
+            # A leftover WAL from another database would be replayed into the restored one
+            if entry['kind'] == 'sqlite':
+                for suffix in ('-wal', '-shm'):
+                    if os.path.exists(dest + suffix):
+                        os.remove(dest + suffix)
+            os.replace(tmp_path, dest)
+            restored += 1
+
+    age_hours = (time.time() - manifest['created_at']) / 3600
+    print(f"📦 Restored {restored}/{len(manifest['files'])} state files from {bundle_path} "
+          f"(exported {age_hours:.1f}h ago)")
+    return restored
+
+
+def is_known_state_path(relpath, kind):
+    """True if a bundle entry is one of the state files this module manages"""
+    if kind == 'sqlite':
+        return relpath in SQLITE_FILES
+    if kind == 'media':
+        return os.sep not in relpath and any(fnmatch.fnmatch(relpath, pattern) for pattern in MEDIA_PATTERNS)
+    return relpath in STATE_FILES or any(relpath.startswith(directory + os.sep) for directory in STATE_DIRS)
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if not args or args[0] not in ('export', 'import'):
+        print(__doc__)
+        sys.exit(1)
+
+    bundle = args[1] if len(args) > 1 else DEFAULT_BUNDLE
+    if args[0] == 'export':
+        export_state(bundle, include_media='--include-media' in sys.argv)
+    elif not os.path.exists(bundle):
+        print(f"📦 No state bundle at {bundle} - starting cold")
+    else:
+        import_state(bundle)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Template Compiler - ContentTemplate patterns compiled once for fast rendering
+Format strings are parsed and checked against the template's variables and
+context fields up front, so a render is one pass over pre-split segments
+"""
+
+import random
+from string import Formatter
+
+
+def compile_pattern(pattern):
+    """Split a format string into (literal, field, conversion, format_spec) segments"""
+    return tuple(Formatter().parse(pattern))
+
+
+class CompiledTemplate:
+    def __init__(self, template):
+        """Parse title and content patterns and resolve every field they use
+
+        Raises ValueError if a pattern references a field that is neither a
+        template variable nor a declared context field.
+        """
+        self.template = template
+        self.template_type = template.template_type
+        self.context_fields = frozenset(template.context_fields)
+
+        overlap = self.context_fields & template.variables.keys()
+        if overlap:
+            raise ValueError(f"{template.template_type}: fields {sorted(overlap)} are both variables and context")
+
+        self.title_segments = compile_pattern(template.title_pattern)
+        self.content_segments = compile_pattern('\n\n'.join(template.content_structure))
+
+        used = set()
+        for segments in (self.title_segments, self.content_segments):
+            for _, field_name, _, format_spec in segments:
+                if field_name is None:
+                    continue
+                if not field_name or not field_name.isidentifier() or '{' in (format_spec or ''):
+                    raise ValueError(f"{template.template_type}: unsupported field {{{field_name}}}")
+                if field_name not in self.context_fields and field_name not in template.variables:
+                    raise ValueError(f"{template.template_type}: unknown field {{{field_name}}}")
+                used.add(field_name)
+
+        # Only pools that a pattern actually uses are drawn from at render time
+        self.variable_pools = tuple(
+            (name, tuple(pool)) for name, pool in template.variables.items() if name in used
+        )
+        for name, pool in self.variable_pools:
+            if not pool:
+                raise ValueError(f"{template.template_type}: variable '{name}' has no values")
+
+    @staticmethod
+    def _render_segments(segments, values):
+        """Join literals and formatted fields in one pass"""
+        parts = []
+        for literal, field_name, conversion, format_spec in segments:
+            if literal:
+                parts.append(literal)
+            if field_name is not None:
+                value = values[field_name]
+                if conversion == 'r':
+                    value = repr(value)
+                elif conversion == 's':
+                    value = str(value)
+                elif conversion == 'a':
+                    value = ascii(value)
+                parts.append(format(value, format_spec) if format_spec else str(value))
+        return ''.join(parts)
+
+    def render(self, context, rng=random):
+        """Return (title, content) with variables drawn from their pools"""
+        missing = self.context_fields.difference(context)
+        if missing:
+            raise ValueError(f"{self.template_type}: missing context fields {sorted(missing)}")
+
+        values = {name: rng.choice(pool) for name, pool in self.variable_pools}
+        values.update(context)
+        return (self._render_segments(self.title_segments, values),
+                self._render_segments(self.content_segments, values))
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Content Batch Tests
+Pins batch generation against a small catalogue, with every store in a temporary directory
+"""
+
+import os
+import tempfile
+
+from content_dedup import ContentHashIndex, NearDuplicateIndex
+from content_pool import ContentPool
+from infinite_content_engine import AITool, InfiniteContentEngine
+from memory_journal import MemoryJournal
+from tool_store import ToolStore
+
+
+def isolated_engine(workdir, tools):
+    """Engine whose history, catalogue and pool live in workdir, with a fixed catalogue and no scraping"""
+    engine = InfiniteContentEngine()
+    engine.memory_journal = MemoryJournal(os.path.join(workdir, 'memory.json'),
+                                          os.path.join(workdir, 'memory.journal'))
+    engine.pending_events = []
+    engine.content_history = engine.load_memory()
+    engine.content_index = ContentHashIndex(os.path.join(workdir, 'hashes.bin'))
+    engine.near_duplicate_index = NearDuplicateIndex(os.path.join(workdir, 'minhash.bin'),
+                                                     engine.near_duplicate_threshold)
+    engine.tool_store = ToolStore(AITool, os.path.join(workdir, 'tools.db'))
+    engine.tool_store.upsert_tools(tools, 'test')
+    engine.content_pool = ContentPool(os.path.join(workdir, 'pool.db'))
+    engine.update_ai_tools_database = lambda force=False, crawl=False: None
+    return engine
+
+
+def make_tool(name):
+    """Catalogue entry with fixed attributes"""
+    return AITool(name=name, description=f"{name} automates busywork", category="Automation",
+                  url=f"https://{name.lower()}.example", pricing="Free tier", use_case="Automation",
+                  income_potential="$500-2000/month")
+
+
+def test_batch_with_one_tool():
+    """A one-tool catalogue never renders the two-tool combo template"""
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = isolated_engine(workdir, [make_tool("Solo")])
+        posts = engine.generate_batch(3)
+        assert posts
+        formats = engine.content_history['successful_formats']
+        assert len(formats) == len(posts)
+        assert "combo_strategy" not in formats
+        engine.tool_store.close()
+        engine.content_pool.close()
+
+
+def test_batch_with_two_tools_uses_combo():
+    """With two tools the combo template is part of the rotation"""
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = isolated_engine(workdir, [make_tool("Alpha"), make_tool("Beta")])
+        engine.generate_batch(len(engine.templates))
+        assert "combo_strategy" in engine.content_history['successful_formats']
+        engine.tool_store.close()
+        engine.content_pool.close()
+
+
+if __name__ == "__main__":
+    for test in (test_batch_with_one_tool, test_batch_with_two_tools_uses_combo):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher Tests
+Pins word-boundary and plural matching used by the news, industry and link filters
+"""
+
+from keyword_matcher import KeywordMatcher, plural_forms
+
+
+def test_word_boundaries():
+    """Keywords match whole words only"""
+    matcher = KeywordMatcher(["ai", "make.com", "machine learning"])
+    assert matcher.find_all("Check your email and Gmail") == []
+    assert matcher.find_all("An AI workflow on Make.com") == ["ai", "make.com"]
+    assert matcher.find_all("Machine-learning is not machine learning") == ["machine learning"]
+    assert not matcher.contains_any("machines learning")
+
+
+def test_plurals_of_last_word():
+    """Plural forms of a keyword's last word match the keyword"""
+    matcher = KeywordMatcher(["llm", "startup", "neural network", "model", "company"])
+    assert matcher.find_all("Comparing open LLMs on coding") == ["llm"]
+    assert matcher.find_all("Two startups raise seed") == ["startup"]
+    assert matcher.find_all("Neural networks explained") == ["neural network"]
+    assert matcher.find_all("New models from Mistral") == ["model"]
+    assert matcher.find_all("AI companies hiring") == ["company"]
+    # Only the last word is pluralised
+    assert matcher.find_all("neurals network") == []
+
+
+def test_plural_that_is_its_own_keyword():
+    """A plural that is itself a keyword only counts as that keyword"""
+    matcher = KeywordMatcher.from_groups({"tech": ["new"], "news": ["news"]})
+    assert matcher.group_counts("Breaking news today") == {"news": 1}
+
+
+def test_group_counts_count_distinct_keywords():
+    """Repeated or pluralised hits count once per keyword"""
+    matcher = KeywordMatcher.from_groups({"tech": ["ai", "model"], "news": ["launch", "release"]})
+    assert matcher.group_counts("AI model, more AI models, a launch") == {"tech": 2, "news": 1}
+
+
+def test_plural_forms():
+    """Regular plural generation"""
+    assert plural_forms("model") == ["models", "modeles"]
+    assert "companies" in plural_forms("company")
+    assert "daies" not in plural_forms("day")
+    assert plural_forms("gpt-4") == []
+
+
+if __name__ == "__main__":
+    for test in (test_word_boundaries, test_plurals_of_last_word, test_plural_that_is_its_own_keyword,
+                 test_group_counts_count_distinct_keywords, test_plural_forms):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tool Names - Canonical identity for tool names from different sources
+"Otter.ai", "Otter AI", "OtterAI" and "otter.ai" all map to the same key,
+so the catalogue keeps one entry per tool no matter which scraper found it
+"""
+
+import re
+import unicodedata
+
+# "OtterAI" -> "Otter AI" (a trailing AI glued to a lowercase letter)
+CAMEL_AI_SUFFIX = re.compile(r'(?<=[a-z])AI$')
+
+# Trailing " AI", ".ai", ".com", ".io", " app"... as a separate token; repeated ("Foo AI App")
+GENERIC_SUFFIXES = re.compile(r'(?:(?:\s+|[._-])(?:ai|app|com|io|co|so|tech))+$')
+
+NON_ALNUM = re.compile(r'[\W_]+')
+
+
+def strip_accents(text):
+    """Drop combining marks after Unicode decomposition ("Café" -> "Cafe")"""
+    return ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+
+
+def canonical_tool_name(name):
+    """Catalogue key for a tool name
+
+    The key is only used for identity; the display name of a tool is kept
+    as scraped.
+    """
+    text = strip_accents(unicodedata.normalize('NFKC', name)).strip()
+    text = CAMEL_AI_SUFFIX.sub(' AI', text).casefold()
+    stripped = GENERIC_SUFFIXES.sub('', text)
+    key = NON_ALNUM.sub('', stripped)
+    # A name that is only a suffix ("AI", "App") keeps it rather than becoming empty
+    return key or NON_ALNUM.sub('', text)
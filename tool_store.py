@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Tool Store - Indexed SQLite catalogue of AI tools
+Replaces the pickled tool list with upserts and indexed queries
+"""
+
+import random
+import sqlite3
+import threading
+import time
+
+from tool_names import canonical_tool_name
+
+TOOL_FIELDS = ('name', 'description', 'category', 'url', 'pricing', 'use_case', 'income_potential')
+
+
+class ToolStore:
+    def __init__(self, tool_class, db_path="/tmp/ai_tools.db"):
+        """Open (or create) the tool catalogue"""
+        self.tool_class = tool_class
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.create_schema()
+
+    def create_schema(self):
+        """Create tables and indexes if missing"""
+        with self.lock, self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS tools (
+                    key TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    description TEXT,
+                    category TEXT,
+                    url TEXT,
+                    pricing TEXT,
+                    use_case TEXT,
+                    income_potential TEXT,
+                    source TEXT,
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL,
+                    last_used REAL,
+                    rotation_seq INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS idx_tools_category ON tools(category);
+                CREATE INDEX IF NOT EXISTS idx_tools_source ON tools(source);
+                CREATE INDEX IF NOT EXISTS idx_tools_last_seen ON tools(last_seen);
+                DROP INDEX IF EXISTS idx_tools_fresh;
+                CREATE TABLE IF NOT EXISTS sources (
+                    name TEXT PRIMARY KEY,
+                    last_refresh REAL NOT NULL,
+                    last_tool_count INTEGER
+                );
+                DROP TABLE IF EXISTS meta;
+            """)
+            self.migrate_rotation()
+            self.migrate_canonical_keys()
+
+    def migrate_rotation(self):
+        """Add the rotation queue to catalogues created before it existed"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(tools)")}
+        if 'rotation_seq' not in columns:
+            self.conn.execute("ALTER TABLE tools ADD COLUMN rotation_seq INTEGER")
+
+        # Unused tools go first in shuffled order, then used ones by last use
+        keys = [row[0] for row in self.conn.execute(
+            "SELECT key FROM tools WHERE rotation_seq IS NULL AND last_used IS NULL")]
+        random.shuffle(keys)
+        keys += [row[0] for row in self.conn.execute(
+            "SELECT key FROM tools WHERE rotation_seq IS NULL AND last_used IS NOT NULL ORDER BY last_used")]
+        self.conn.executemany("UPDATE tools SET rotation_seq = ? WHERE key = ?", list(enumerate(keys)))
+
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tools_rotation ON tools(rotation_seq)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tools_category_rotation ON tools(category, rotation_seq)")
+
+    def migrate_canonical_keys(self):
+        """Re-key catalogues created before canonical names, merging variants of one tool
+
+        The first-seen entry keeps its attributes; the merged entry keeps the
+        latest last_seen/last_used and the earliest rotation position.
+        """
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= 1:
+            return
+        merged = {}
+        for row in self.conn.execute("SELECT * FROM tools ORDER BY first_seen, rowid"):
+            row = dict(row)
+            key = self.tool_key(row['name'])
+            kept = merged.get(key)
+            if kept is None:
+                merged[key] = dict(row, key=key)
+                continue
+            kept['last_seen'] = max(kept['last_seen'], row['last_seen'])
+            if row['last_used'] is not None:
+                kept['last_used'] = max(kept['last_used'] or 0, row['last_used'])
+            if row['rotation_seq'] is not None:
+                kept['rotation_seq'] = min(
+                    kept['rotation_seq'] if kept['rotation_seq'] is not None else row['rotation_seq'],
+                    row['rotation_seq']
+                )
+
+        rows = list(merged.values())
+        self.conn.execute("DELETE FROM tools")
+        if rows:
+            columns = list(rows[0])
+            self.conn.executemany(
+                f"INSERT INTO tools ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [tuple(row[column] for column in columns) for row in rows]
+            )
+        self.conn.execute("PRAGMA user_version = 1")
+
+    def tool_key(self, name):
+        """Identity of a tool in the catalogue: its canonical name"""
+        return canonical_tool_name(name)
+
+    def row_to_tool(self, row):
+        """Convert a database row into an AITool"""
+        return self.tool_class(**{field: row[field] for field in TOOL_FIELDS})
+
+    def upsert_tools(self, tools, source):
+        """Insert new tools and refresh last_seen on known ones; returns number of new tools
+
+        Known tools keep their stored description, pricing and other attributes,
+        so a re-scrape never changes the identity of a tool already in the catalogue.
+        New tools join the front of the rotation queue in shuffled order.
+        """
+        now = time.time()
+        tools = list(tools)
+        random.shuffle(tools)
+        with self.lock, self.conn:
+            front = self.conn.execute("SELECT MIN(rotation_seq) FROM tools").fetchone()[0] or 0
+            rows = [
+                (self.tool_key(tool.name),) + tuple(getattr(tool, field) for field in TOOL_FIELDS)
+                + (source, now, now, front - len(tools) + i)
+                for i, tool in enumerate(tools)
+            ]
+            before = self.conn.execute("SELECT COUNT(*) FROM tools").fetchone()[0]
+            self.conn.executemany("""
+                INSERT INTO tools (key, name, description, category, url, pricing, use_case,
+                                   income_potential, source, first_seen, last_seen, rotation_seq)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    last_seen = excluded.last_seen
+            """, rows)
+            after = self.conn.execute("SELECT COUNT(*) FROM tools").fetchone()[0]
+        return after - before
+
+    def count(self):
+        """Number of tools in the catalogue"""
+        return self.conn.execute("SELECT COUNT(*) FROM tools").fetchone()[0]
+
+    def all_tools(self):
+        """Every tool in the catalogue (full scan - avoid on hot paths)"""
+        rows = self.conn.execute("SELECT * FROM tools ORDER BY first_seen").fetchall()
+        return [self.row_to_tool(row) for row in rows]
+
+    def known_names(self, names):
+        """Subset of names already in the catalogue"""
+        keys = {}
+        for name in names:
+            keys.setdefault(self.tool_key(name), []).append(name)
+        known = set()
+        key_list = list(keys)
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(key_list), 500):
+            chunk = key_list[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT key FROM tools WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            for row in rows:
+                known.update(keys[row[0]])
+        return known
+
+    def next_tools(self, limit, category=None):
+        """Least recently used tools from the head of the rotation queue (index seek, no scan)"""
+        if category:
+            rows = self.conn.execute(
+                "SELECT * FROM tools WHERE category = ? ORDER BY rotation_seq LIMIT ?", (category, limit)
+            ).fetchall()
+        else:
+            rows = self.conn.execute("SELECT * FROM tools ORDER BY rotation_seq LIMIT ?", (limit,)).fetchall()
+        return [self.row_to_tool(row) for row in rows]
+
+    def mark_used(self, names):
+        """Move featured tools to the back of the rotation queue"""
+        now = time.time()
+        with self.lock, self.conn:
+            back = self.conn.execute("SELECT MAX(rotation_seq) FROM tools").fetchone()[0] or 0
+            self.conn.executemany(
+                "UPDATE tools SET last_used = ?, rotation_seq = ? WHERE key = ?",
+                [(now, back + i + 1, self.tool_key(name)) for i, name in enumerate(names)]
+            )
+
+    def get_source_refresh(self, source):
+        """Timestamp of the last successful refresh of a source, or None"""
+        row = self.conn.execute("SELECT last_refresh FROM sources WHERE name = ?", (source,)).fetchone()
+        return row[0] if row else None
+
+    def set_source_refresh(self, source, tool_count, refreshed_at=None):
+        """Record a successful refresh of a source"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO sources (name, last_refresh, last_tool_count) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET last_refresh = excluded.last_refresh, "
+                "last_tool_count = excluded.last_tool_count",
+                (source, refreshed_at or time.time(), tool_count)
+            )
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()